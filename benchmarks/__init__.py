@@ -0,0 +1 @@
+"""Benchmarks de l'intégration 2N Intercom contre de faux appareils locaux."""
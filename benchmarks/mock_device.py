@@ -0,0 +1,407 @@
+"""
+Faux appareil 2N (serveur aiohttp local) pour les benchmarks.
+Fichier: benchmarks/mock_device.py
+
+Implémente les endpoints de l'API HTTP 2N utilisés par l'intégration
+(system/*, switch/*, io/*, call/*, phone/*, camera/caps, camera/snapshot, display/*)
+avec une latence, un taux d'échec et des tailles de réponse configurables.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import random
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow est optionnel pour le faux appareil
+    Image = None
+
+# Marqueurs de début et de fin d'une image JPEG, segment de commentaire
+JPEG_SOI = b"\xff\xd8"
+JPEG_EOI = b"\xff\xd9"
+JPEG_COM = b"\xff\xfe"
+JPEG_SEGMENT_MAX = 65533
+
+MJPEG_BOUNDARY = "twonmockframe"
+
+
+@dataclass(slots=True)
+class MockConfig:
+    """Comportement d'un faux appareil."""
+
+    # Latence ajoutée à chaque réponse, et variation aléatoire (secondes)
+    latency: float = 0.005
+    jitter: float = 0.002
+    # Probabilité qu'une requête échoue (HTTP 503)
+    failure_rate: float = 0.0
+    # Taille minimale des images renvoyées par camera/snapshot (octets)
+    snapshot_size: int = 60_000
+    # Octets de remplissage ajoutés aux réponses de statut
+    status_padding: int = 0
+    switches: int = 2
+    inputs: int = 2
+    outputs: int = 1
+    display_size: tuple[int, int] = (320, 240)
+    seed: int | None = None
+
+
+@dataclass(slots=True)
+class MockStats:
+    """Requêtes reçues par un faux appareil."""
+
+    requests: dict[str, int] = field(default_factory=dict)
+    failures: int = 0
+    bytes_sent: int = 0
+
+    def count(self, endpoint: str) -> None:
+        """Compte une requête."""
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    @property
+    def total(self) -> int:
+        """Nombre total de requêtes reçues."""
+        return sum(self.requests.values())
+
+
+def make_jpeg(width: int, height: int, size: int) -> bytes:
+    """Construit un JPEG décodable, complété par des segments de commentaire.
+
+    Les segments de remplissage ne contiennent aucun octet 0xFF : ils ne
+    perturbent pas la recherche des marqueurs SOI/EOI du flux MJPEG.
+    """
+    if Image is not None:
+        output = io.BytesIO()
+        Image.new("RGB", (width, height), (40, 80, 120)).save(output, "JPEG")
+        base = output.getvalue()
+    else:
+        base = JPEG_SOI + JPEG_EOI
+
+    segments = []
+    missing = size - len(base)
+    while missing > 4:
+        chunk = min(missing - 4, JPEG_SEGMENT_MAX)
+        segments.append(JPEG_COM + (chunk + 2).to_bytes(2, "big") + bytes(chunk))
+        missing -= chunk + 4
+    return base[:2] + b"".join(segments) + base[2:]
+
+
+class MockTwoNDevice:
+    """Faux appareil 2N servant l'API HTTP sur 127.0.0.1."""
+
+    def __init__(self, serial: str, config: MockConfig | None = None) -> None:
+        """Initialisation du faux appareil."""
+        self.serial = serial
+        self.config = config or MockConfig()
+        self.stats = MockStats()
+        self.host = "127.0.0.1"
+        self.port = 0
+        self._random = random.Random(self.config.seed)
+        self._started = time.time()
+        self._runner: web.AppRunner | None = None
+        self.switch_states = {
+            index: False for index in range(1, self.config.switches + 1)
+        }
+        self.io_states = {
+            **{f"input{index}": False for index in range(1, self.config.inputs + 1)},
+            **{f"relay{index}": False for index in range(1, self.config.outputs + 1)},
+        }
+        self.sessions: dict[int, dict[str, Any]] = {}
+        self.display: Any = None
+        self._snapshots: dict[tuple[int, int], bytes] = {}
+
+    def snapshot(self, width: int, height: int) -> bytes:
+        """Image JPEG de la résolution demandée, complétée jusqu'à snapshot_size."""
+        key = (width, height)
+        if (image := self._snapshots.get(key)) is None:
+            image = self._snapshots[key] = make_jpeg(
+                width, height, self.config.snapshot_size
+            )
+        return image
+
+    async def async_start(self) -> None:
+        """Démarre le serveur sur un port libre."""
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_route("*", "/api/{endpoint:.+}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, 0))
+        self.port = sock.getsockname()[1]
+        await web.SockSite(self._runner, sock).start()
+
+    async def async_stop(self) -> None:
+        """Arrête le serveur."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def ring(self, session: int = 1) -> None:
+        """Simule un appel entrant."""
+        self.sessions[session] = {
+            "session": session,
+            "direction": "incoming",
+            "state": "ringing",
+        }
+
+    def _json(self, result: Any = None, padded: bool = False) -> web.Response:
+        """Réponse JSON au format de l'API 2N."""
+        payload: dict[str, Any] = {"success": True}
+        if result is not None:
+            payload["result"] = result
+            if padded and self.config.status_padding:
+                result["padding"] = "x" * self.config.status_padding
+        response = web.json_response(payload)
+        self.stats.bytes_sent += len(response.body)
+        return response
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Point d'entrée de toutes les requêtes /api/*."""
+        endpoint = request.match_info["endpoint"]
+        self.stats.count(endpoint)
+
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._random.random() < self.config.failure_rate:
+            self.stats.failures += 1
+            raise web.HTTPServiceUnavailable()
+
+        handler = getattr(self, f"_api_{endpoint.replace('/', '_')}", None)
+        if handler is None:
+            raise web.HTTPNotFound()
+        return await handler(request)
+
+    async def _api_system_info(self, request: web.Request) -> web.Response:
+        """Endpoint system/info."""
+        return self._json(
+            {
+                "variant": "2N IP Verso",
+                "serialNumber": self.serial,
+                "hwVersion": "535v1",
+                "swVersion": "2.40.0.54.2",
+                "buildType": "beta",
+                "deviceName": f"Mock {self.serial}",
+            }
+        )
+
+    async def _api_system_status(self, request: web.Request) -> web.Response:
+        """Endpoint system/status."""
+        now = time.time()
+        return self._json(
+            {
+                "systemTime": int(now),
+                "upTime": int(now - self._started),
+                "temperature": 35.5,
+            },
+            padded=True,
+        )
+
+    async def _api_system_restart(self, request: web.Request) -> web.Response:
+        """Endpoint system/restart."""
+        self._started = time.time()
+        self.display = None
+        return self._json()
+
+    async def _api_switch_caps(self, request: web.Request) -> web.Response:
+        """Endpoint switch/caps."""
+        return self._json(
+            {
+                "switches": [
+                    {"switch": index, "enabled": True, "mode": "monostable"}
+                    for index in self.switch_states
+                ]
+            }
+        )
+
+    async def _api_switch_status(self, request: web.Request) -> web.Response:
+        """Endpoint switch/status."""
+        return self._json(
+            {
+                "switches": [
+                    {"switch": index, "active": active, "locked": False}
+                    for index, active in self.switch_states.items()
+                ]
+            },
+            padded=True,
+        )
+
+    async def _api_switch_ctrl(self, request: web.Request) -> web.Response:
+        """Endpoint switch/ctrl."""
+        switch = int(request.query.get("switch", 1))
+        if switch not in self.switch_states:
+            raise web.HTTPBadRequest()
+        action = request.query.get("action", "trigger")
+        self.switch_states[switch] = action in ("on", "trigger")
+        return self._json()
+
+    async def _api_io_caps(self, request: web.Request) -> web.Response:
+        """Endpoint io/caps."""
+        return self._json(
+            {
+                "ports": [
+                    {"port": port, "type": "input" if port.startswith("input") else "output"}
+                    for port in self.io_states
+                ]
+            }
+        )
+
+    async def _api_io_status(self, request: web.Request) -> web.Response:
+        """Endpoint io/status."""
+        return self._json(
+            {
+                "ports": [
+                    {"port": port, "state": "active" if active else "inactive"}
+                    for port, active in self.io_states.items()
+                ]
+            },
+            padded=True,
+        )
+
+    async def _api_io_ctrl(self, request: web.Request) -> web.Response:
+        """Endpoint io/ctrl."""
+        port = request.query.get("port")
+        if port not in self.io_states:
+            raise web.HTTPBadRequest()
+        self.io_states[port] = request.query.get("action") == "on"
+        return self._json()
+
+    async def _api_call_status(self, request: web.Request) -> web.Response:
+        """Endpoint call/status."""
+        return self._json({"sessions": list(self.sessions.values())}, padded=True)
+
+    async def _api_call_dial(self, request: web.Request) -> web.Response:
+        """Endpoint call/dial."""
+        session = max(self.sessions, default=0) + 1
+        self.sessions[session] = {
+            "session": session,
+            "direction": "outgoing",
+            "state": "connecting",
+        }
+        return self._json({"session": session})
+
+    async def _api_call_answer(self, request: web.Request) -> web.Response:
+        """Endpoint call/answer."""
+        for session in self.sessions.values():
+            if session["state"] == "ringing":
+                session["state"] = "connected"
+        return self._json()
+
+    async def _api_call_hangup(self, request: web.Request) -> web.Response:
+        """Endpoint call/hangup."""
+        self.sessions.clear()
+        return self._json()
+
+    async def _api_phone_status(self, request: web.Request) -> web.Response:
+        """Endpoint phone/status."""
+        return self._json(
+            {
+                "accounts": [
+                    {
+                        "account": 1,
+                        "accountName": "Mock",
+                        "sipUri": f"sip:{self.serial}@127.0.0.1",
+                        "registerState": "registered",
+                    }
+                ]
+            },
+            padded=True,
+        )
+
+    async def _api_display_caps(self, request: web.Request) -> web.Response:
+        """Endpoint display/caps."""
+        width, height = self.config.display_size
+        return self._json(
+            {
+                "displays": [
+                    {"name": "ext1", "resolution": {"width": width, "height": height}}
+                ]
+            }
+        )
+
+    async def _api_display_text(self, request: web.Request) -> web.Response:
+        """Endpoint display/text."""
+        self.display = ("text", request.query.get("text", ""))
+        return self._json()
+
+    async def _api_display_image(self, request: web.Request) -> web.Response:
+        """Endpoint display/image."""
+        self.display = ("image", len(await request.read()))
+        return self._json()
+
+    async def _api_camera_caps(self, request: web.Request) -> web.Response:
+        """Endpoint camera/caps."""
+        return self._json(
+            {
+                "jpegResolution": [
+                    {"width": width, "height": height}
+                    for width, height in ((320, 240), (640, 480), (1280, 960))
+                ]
+            }
+        )
+
+    async def _api_camera_snapshot(
+        self, request: web.Request
+    ) -> web.StreamResponse:
+        """Endpoint camera/snapshot."""
+        image = self.snapshot(
+            int(request.query.get("width", 640)), int(request.query.get("height", 480))
+        )
+        fps = request.query.get("fps")
+        if fps is None:
+            self.stats.bytes_sent += len(image)
+            return web.Response(body=image, content_type="image/jpeg")
+
+        # Flux MJPEG : une image par période jusqu'à la déconnexion du client
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}"
+            }
+        )
+        await response.prepare(request)
+        period = 1 / max(int(fps), 1)
+        try:
+            while True:
+                await response.write(
+                    f"--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                    f"Content-Length: {len(image)}\r\n\r\n".encode()
+                    + image
+                    + b"\r\n"
+                )
+                self.stats.bytes_sent += len(image)
+                await asyncio.sleep(period)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        return response
+
+
+class MockFleet:
+    """Ensemble de faux appareils démarrés ensemble."""
+
+    def __init__(self, count: int, config: MockConfig | None = None) -> None:
+        """Initialisation de la flotte."""
+        self.devices = [
+            MockTwoNDevice(f"54-{index:06d}", config) for index in range(count)
+        ]
+
+    async def __aenter__(self) -> MockFleet:
+        """Démarre tous les appareils."""
+        await asyncio.gather(*(device.async_start() for device in self.devices))
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Arrête tous les appareils."""
+        await asyncio.gather(*(device.async_stop() for device in self.devices))
+
+    @property
+    def requests(self) -> int:
+        """Nombre total de requêtes reçues par la flotte."""
+        return sum(device.stats.total for device in self.devices)
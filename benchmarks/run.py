@@ -0,0 +1,330 @@
+"""
+Suite de benchmarks de l'intégration 2N Intercom.
+Fichier: benchmarks/run.py
+
+Mesure, contre une flotte de faux appareils locaux (mock_device.py) :
+- la durée des cycles de polling du coordinateur ;
+- le débit de snapshots servis à des spectateurs simultanés ;
+- la latence appui → confirmation des commandes de switch.
+
+Usage (depuis la racine du dépôt, dans un environnement Home Assistant) :
+    python -m benchmarks.run --devices 1 10 50 200 --output benchmarks/results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.twon_intercom import (
+    COMMAND_CONNECTIONS_PER_HOST,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SNAPSHOT_TTL,
+    TwoNAPI,
+    TwoNDataUpdateCoordinator,
+    async_create_device_session,
+)
+from custom_components.twon_intercom.auth import AUTH_BASIC
+from custom_components.twon_intercom.scheduler import TwoNFleetScheduler
+from custom_components.twon_intercom.snapshot import SnapshotCache
+
+from .mock_device import MockConfig, MockFleet, MockTwoNDevice
+
+# Version du format du fichier de résultats
+RESULTS_VERSION = 1
+
+DEFAULT_DEVICE_COUNTS = (1, 10, 50, 200)
+DEFAULT_VIEWER_COUNTS = (1, 10, 50)
+
+
+def summarize(samples: list[float]) -> dict[str, float | int | None]:
+    """Percentiles d'une série de durées (secondes → millisecondes)."""
+    if not samples:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "max_ms": None}
+    ordered = sorted(samples)
+
+    def _percentile(percent: float) -> float:
+        index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+        return round(ordered[index] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": _percentile(50),
+        "p95_ms": _percentile(95),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+@asynccontextmanager
+async def async_coordinators(
+    hass: HomeAssistant, devices: list[MockTwoNDevice]
+) -> AsyncIterator[list[TwoNDataUpdateCoordinator]]:
+    """Crée un coordinateur (et ses sessions) par faux appareil."""
+    scheduler = TwoNFleetScheduler()
+    sessions = []
+    coordinators = []
+    for device in devices:
+        session = async_create_device_session(False, False)
+        command_session = async_create_device_session(
+            False, False, COMMAND_CONNECTIONS_PER_HOST
+        )
+        sessions.extend((session, command_session))
+        api = TwoNAPI(
+            device.host,
+            "admin",
+            "admin",
+            device.port,
+            session,
+            AUTH_BASIC,
+            False,
+            command_session,
+        )
+        coordinators.append(
+            TwoNDataUpdateCoordinator(
+                hass, api, DEFAULT_SCAN_INTERVAL, scheduler, device.serial
+            )
+        )
+    try:
+        yield coordinators
+    finally:
+        for coordinator in coordinators:
+            await coordinator.command_queue.async_stop()
+            await coordinator.control_queue.async_stop()
+        await asyncio.gather(*(session.close() for session in sessions))
+
+
+async def bench_poll_cycle(
+    hass: HomeAssistant, config: MockConfig, devices: int, cycles: int
+) -> dict[str, Any]:
+    """Durée des cycles de polling de toute la flotte."""
+    async with MockFleet(devices, config) as fleet, async_coordinators(
+        hass, fleet.devices
+    ) as coordinators:
+        # Premier cycle : system/info et capacités, exclu des mesures
+        await asyncio.gather(*(c.async_refresh() for c in coordinators))
+        requests_before = fleet.requests
+
+        cycle_samples: list[float] = []
+        round_samples: list[float] = []
+        failed = 0
+        for _ in range(cycles):
+            start = time.monotonic()
+            await asyncio.gather(*(c.async_refresh() for c in coordinators))
+            round_samples.append(time.monotonic() - start)
+            for coordinator in coordinators:
+                if coordinator.last_update_success:
+                    cycle_samples.append(coordinator.last_cycle_duration)
+                else:
+                    failed += 1
+
+        return {
+            "benchmark": "poll_cycle",
+            "devices": devices,
+            "cycles": cycles,
+            "device_cycle": summarize(cycle_samples),
+            "fleet_round": summarize(round_samples),
+            "failed_cycles": failed,
+            "requests_per_cycle": round(
+                (fleet.requests - requests_before) / (cycles * devices), 2
+            ),
+        }
+
+
+async def bench_snapshot(
+    hass: HomeAssistant, config: MockConfig, viewers: int, duration: float
+) -> dict[str, Any]:
+    """Débit de snapshots servis à des spectateurs simultanés d'un appareil."""
+    async with MockFleet(1, config) as fleet, async_coordinators(
+        hass, fleet.devices
+    ) as coordinators:
+        api = coordinators[0].api
+        cache = SnapshotCache(
+            hass, api.get_camera_snapshot, DEFAULT_SNAPSHOT_TTL, api.get_camera_caps
+        )
+        samples: list[float] = []
+        errors = 0
+        deadline = time.monotonic() + duration
+
+        async def _viewer() -> None:
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.monotonic()
+                try:
+                    await cache.async_get_image(640, 480)
+                except Exception:  # pylint: disable=broad-except
+                    errors += 1
+                else:
+                    samples.append(time.monotonic() - start)
+                # Rafraîchissement d'une carte caméra du tableau de bord
+                await asyncio.sleep(0.1)
+
+        await asyncio.gather(*(_viewer() for _ in range(viewers)))
+        device = fleet.devices[0]
+        return {
+            "benchmark": "snapshot",
+            "viewers": viewers,
+            "duration_s": duration,
+            "images_per_s": round(len(samples) / duration, 2),
+            "device_requests_per_s": round(
+                device.stats.requests.get("camera/snapshot", 0) / duration, 2
+            ),
+            "device_bytes_per_s": round(device.stats.bytes_sent / duration),
+            "latency": summarize(samples),
+            "errors": errors,
+            "cache": cache.stats,
+        }
+
+
+async def bench_command(
+    hass: HomeAssistant, config: MockConfig, devices: int, commands: int
+) -> dict[str, Any]:
+    """Latence appui → confirmation des commandes de switch."""
+    async with MockFleet(devices, config) as fleet, async_coordinators(
+        hass, fleet.devices
+    ) as coordinators:
+        await asyncio.gather(*(c.async_refresh() for c in coordinators))
+        samples: list[float] = []
+        errors = 0
+
+        async def _press(coordinator: TwoNDataUpdateCoordinator) -> None:
+            nonlocal errors
+            for index in range(commands):
+                start = time.monotonic()
+                try:
+                    await coordinator.async_execute_command(
+                        "switch", 1, "on" if index % 2 == 0 else "off"
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    errors += 1
+                else:
+                    samples.append(time.monotonic() - start)
+
+        await asyncio.gather(*(_press(coordinator) for coordinator in coordinators))
+        return {
+            "benchmark": "command",
+            "devices": devices,
+            "commands_per_device": commands,
+            "latency": summarize(samples),
+            "errors": errors,
+        }
+
+
+def _git_commit() -> str | None:
+    """Commit courant du dépôt, pour rattacher les résultats à une version."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _raise_file_limit() -> None:
+    """Relève la limite de descripteurs de fichiers (flottes de 200 appareils)."""
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:  # pragma: no cover - Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = 8192 if hard == resource.RLIM_INFINITY else min(hard, 8192)
+    if soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    """Exécute les benchmarks demandés."""
+    config = MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        snapshot_size=args.snapshot_size,
+        status_padding=args.status_padding,
+        seed=args.seed,
+    )
+    results: list[dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            for devices in args.devices:
+                if "poll" in args.benchmarks:
+                    results.append(
+                        await bench_poll_cycle(hass, config, devices, args.cycles)
+                    )
+                if "command" in args.benchmarks:
+                    results.append(
+                        await bench_command(hass, config, devices, args.commands)
+                    )
+                print(f"{devices} appareil(s) : terminé", file=sys.stderr)
+            if "snapshot" in args.benchmarks:
+                for viewers in args.viewers:
+                    results.append(
+                        await bench_snapshot(hass, config, viewers, args.duration)
+                    )
+                    print(f"{viewers} spectateur(s) : terminé", file=sys.stderr)
+        finally:
+            await hass.async_stop(force=True)
+
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "mock_config": asdict(config),
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        choices=("poll", "snapshot", "command"),
+        default=["poll", "snapshot", "command"],
+    )
+    parser.add_argument(
+        "--devices", nargs="+", type=int, default=list(DEFAULT_DEVICE_COUNTS)
+    )
+    parser.add_argument(
+        "--viewers", nargs="+", type=int, default=list(DEFAULT_VIEWER_COUNTS)
+    )
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--commands", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.002)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--snapshot-size", type=int, default=60_000)
+    parser.add_argument("--status-padding", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="benchmarks/results.json")
+    args = parser.parse_args()
+
+    _raise_file_limit()
+    report = asyncio.run(async_main(args))
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Résultats écrits dans {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,22 @@ Fichier: custom_components/2n_intercom/__init__.py
 """
 
 import asyncio
+import dataclasses
+import json
 import logging
+import math
+import ssl
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from datetime import timedelta
 from typing import Any
+from urllib.parse import quote
 
 import aiohttp
+from aiohttp import hdrs
 import voluptuous as vol
+from yarl import URL
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -20,19 +30,56 @@ from homeassistant.const import (
     CONF_PORT,
     CONF_USERNAME,
     CONF_SCAN_INTERVAL,
+    CONF_SSL,
+    CONF_VERIFY_SSL,
+    EVENT_HOMEASSISTANT_CLOSE,
     Platform,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.service import async_extract_config_entry_ids
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.ssl import (
+    get_default_context,
+    get_default_no_verify_context,
+)
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
+from .auth import AUTH_BASIC, AUTH_DIGEST, DigestAuth
+from .breaker import STATE_CLOSED, CircuitBreaker, TwoNCircuitOpenError
+from .commands import TwoNCommandQueue
+from .display import DisplayContentCache
+from .events import TwoNEventStream
+from .history import KIND_ACCESS, KIND_CALL, DeviceHistory
+from .instrumentation import DeviceInstrumentation, LatencyWindow
+from .models import PARSERS, TwoNData, select_ringing
+from .scheduler import TwoNFleetScheduler
+from .snapshot import PreCaptureBuffer, SnapshotCache
+from .stream import MjpegBroadcaster
+from .transitions import (
+    TIME_SOURCE_ESTIMATED,
+    TIME_SOURCE_LOG,
+    Transition,
+    diff_transitions,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "twon_intercom"
+DATA_FLEET = f"{DOMAIN}_fleet"
 PLATFORMS = [
     Platform.SWITCH,
     Platform.BINARY_SENSOR,
@@ -42,8 +89,176 @@ PLATFORMS = [
 ]
 
 DEFAULT_PORT = 80
+
+CONF_AUTH_METHOD = "auth_method"
+
+# Pool de connexions keep-alive dédié à chaque appareil
+CONNECTIONS_PER_HOST = 4
+KEEPALIVE_TIMEOUT = 60
+
+# Connexions réservées aux commandes (voie prioritaire)
+COMMAND_CONNECTIONS_PER_HOST = 2
+
+# Objectif de latence appui → confirmation d'une commande (secondes)
+COMMAND_LATENCY_TARGET = 0.3
 DEFAULT_SCAN_INTERVAL = 30
 
+# Version du cache des métadonnées (system/info et capacités) par config entry
+STORAGE_VERSION = 1
+
+CONF_SNAPSHOT_TTL = "snapshot_ttl"
+DEFAULT_SNAPSHOT_TTL = 2.0
+
+CONF_RTSP_STREAM = "rtsp_stream"
+RTSP_PORT = 554
+
+SERVICE_SAVE_BURST = "save_burst"
+ATTR_DIRECTORY = "directory"
+ATTR_BEST_ONLY = "best_only"
+
+SAVE_BURST_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DIRECTORY): cv.string,
+        vol.Optional(ATTR_BEST_ONLY, default=False): cv.boolean,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+SERVICE_DIAL = "dial"
+SERVICE_DISPLAY_TEXT = "display_text"
+SERVICE_TRIGGER_SWITCH = "trigger_switch"
+SERVICE_DISPLAY_IMAGE = "display_image"
+ATTR_NUMBER = "number"
+ATTR_TEXT = "text"
+ATTR_SWITCH_NUM = "switch_num"
+ATTR_DURATION = "duration"
+ATTR_PATH = "path"
+ATTR_FORCE = "force"
+
+# Paramètres optionnels de display/text transmis tels quels à l'appareil
+DISPLAY_TEXT_OPTIONS = ("x", "y", "size", "color")
+
+DIAL_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_NUMBER): cv.string},
+    extra=vol.ALLOW_EXTRA,
+)
+
+DISPLAY_TEXT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_TEXT): vol.Any(cv.string, ""),
+        vol.Optional("x"): vol.Coerce(int),
+        vol.Optional("y"): vol.Coerce(int),
+        vol.Optional("size"): vol.All(vol.Coerce(int), vol.Range(min=8, max=72)),
+        vol.Optional("color"): cv.string,
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+DISPLAY_IMAGE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+SERVICE_GET_HISTORY = "get_history"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_TYPE = "type"
+ATTR_LIMIT = "limit"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_TYPE): vol.In([KIND_CALL, KIND_ACCESS]),
+        vol.Optional(ATTR_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+SERVICE_BULK_CONTROL = "bulk_control"
+ATTR_COMMANDS = "commands"
+ATTR_DEVICE_ID = "device_id"
+ATTR_PORT = "port"
+ATTR_ACTION = "action"
+
+BULK_COMMAND_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_DEVICE_ID): cv.string,
+            vol.Exclusive(ATTR_SWITCH_NUM, "output"): cv.positive_int,
+            vol.Exclusive(ATTR_PORT, "output"): cv.string,
+            vol.Required(ATTR_ACTION): vol.In(["on", "off", "trigger"]),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_SWITCH_NUM, ATTR_PORT),
+)
+
+BULK_CONTROL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_COMMANDS): vol.All(
+            cv.ensure_list, vol.Length(min=1), [BULK_COMMAND_SCHEMA]
+        ),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+TRIGGER_SWITCH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SWITCH_NUM, default=1): cv.positive_int,
+        vol.Optional(ATTR_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=100, max=10000)
+        ),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+# Intervalle de réconciliation complète lorsque le flux d'événements est actif
+RECONCILE_INTERVAL = 300
+
+# Nombre maximal de requêtes simultanées vers un même appareil pendant un cycle
+MAX_CONCURRENT_REQUESTS = 3
+
+# Messages de debug pour les endpoints optionnels indisponibles
+OPTIONAL_ENDPOINT_ERRORS = {
+    "switches": "Switches non disponibles: %s",
+    "io": "IO non disponibles: %s",
+    "call": "Statut d'appel non disponible: %s",
+    "phone": "Statut téléphone non disponible: %s",
+}
+
+# Réponses signalant un endpoint non supporté (et non une erreur passagère)
+UNSUPPORTED_HTTP_STATUSES = {404, 501}
+# Codes d'erreur 2N : fonction non supportée, chemin invalide, fonction
+# désactivée, fonction non licenciée
+UNSUPPORTED_ERROR_CODES = {1, 2, 4, 5}
+
+# Délai avant de re-sonder un endpoint détecté comme non supporté (secondes)
+UNSUPPORTED_RETRY_INTERVAL = 6 * 3600
+
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+
+# Polling adaptatif : groupe de cadence de chaque endpoint
+POLL_GROUPS = {
+    "system_status": "system",
+    "switches": "io",
+    "io": "io",
+    "call": "call",
+    "phone": "phone",
+}
+
+# Cadence rapide pendant un appel ou juste après une commande (secondes)
+ADAPTIVE_FAST_INTERVAL = 2
+# Durée de la cadence rapide des IO après une commande de switch (secondes)
+ADAPTIVE_COMMAND_WINDOW = 15
+# Cadence des données qui évoluent lentement (uptime, température, SIP)
+ADAPTIVE_SLOW_INTERVAL = 300
+# Tolérance pour considérer un groupe comme dû lors d'un cycle
+ADAPTIVE_TOLERANCE = 0.5
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
@@ -52,6 +267,11 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Required(CONF_USERNAME): cv.string,
                 vol.Required(CONF_PASSWORD): cv.string,
                 vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+                vol.Optional(CONF_AUTH_METHOD, default=AUTH_BASIC): vol.In(
+                    [AUTH_BASIC, AUTH_DIGEST]
+                ),
+                vol.Optional(CONF_SSL, default=False): cv.boolean,
+                vol.Optional(CONF_VERIFY_SSL, default=False): cv.boolean,
                 vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): cv.positive_int,
             }
         )
@@ -60,6 +280,14 @@ CONFIG_SCHEMA = vol.Schema(
 )
 
 
+class TwoNUnsupportedError(UpdateFailed):
+    """Endpoint non supporté par le modèle, sa licence ou sa configuration."""
+
+
+class TwoNApiError(UpdateFailed):
+    """Requête refusée par l'API (réponse success: false)."""
+
+
 class TwoNAPI:
     """Classe pour interagir avec l'API HTTP 2N."""
 
@@ -70,6 +298,9 @@ class TwoNAPI:
         password: str,
         port: int,
         session: aiohttp.ClientSession,
+        auth_method: str = AUTH_BASIC,
+        use_ssl: bool = False,
+        command_session: aiohttp.ClientSession | None = None,
     ) -> None:
         """Initialisation de l'API 2N."""
         self.host = host
@@ -77,23 +308,151 @@ class TwoNAPI:
         self.username = username
         self.password = password
         self.session = session
-        self.base_url = f"http://{host}:{port}/api"
+        # Voie prioritaire : connexions réservées aux commandes et à leur confirmation
+        self.command_session = command_session or session
+        scheme = "https" if use_ssl else "http"
+        self.base_url = f"{scheme}://{host}:{port}/api"
         self.auth = aiohttp.BasicAuth(username, password)
+        self.digest = DigestAuth(username, password) if auth_method == AUTH_DIGEST else None
+        self.breaker = CircuitBreaker(host)
+        self.instrumentation = DeviceInstrumentation()
 
-    async def _request(
-        self, method: str, endpoint: str, params: dict | None = None
-    ) -> dict:
-        """Effectue une requête HTTP vers l'API."""
+    @asynccontextmanager
+    async def _async_open(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict | None = None,
+        data: bytes | None = None,
+        timeout: aiohttp.ClientTimeout | None = None,
+        command_lane: bool = False,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Ouvre une requête authentifiée (Basic, ou Digest avec nonce réutilisé)."""
+        url = URL(f"{self.base_url}/{endpoint}")
+        if params:
+            url = url.update_query({key: str(value) for key, value in params.items()})
+        timeout = timeout or aiohttp.ClientTimeout(total=10)
+        session = self.command_session if command_lane else self.session
+
+        if self.digest is None:
+            async with session.request(
+                method, url, auth=self.auth, data=data, timeout=timeout
+            ) as response:
+                yield response
+            return
+
+        # Un seul nouvel essai : au premier appel ou lorsque le nonce a expiré
+        for attempt in range(2):
+            headers = {}
+            if authorization := self.digest.authorization(method, url.raw_path_qs):
+                headers[hdrs.AUTHORIZATION] = authorization
+            async with session.request(
+                method, url, headers=headers, data=data, timeout=timeout
+            ) as response:
+                if (
+                    response.status == 401
+                    and attempt == 0
+                    and self.digest.parse_challenge(
+                        response.headers.get(hdrs.WWW_AUTHENTICATE, "")
+                    )
+                ):
+                    continue
+                yield response
+                return
+
+    async def _async_send(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict | None = None,
+        data: bytes | None = None,
+        timeout: float = 10,
+        raw: bool = False,
+        command_lane: bool = False,
+    ) -> Any:
+        """Envoie une requête à travers le disjoncteur de l'appareil."""
         url = f"{self.base_url}/{endpoint}"
+        probe = self.breaker.before_request()
+        start = time.monotonic()
+        # Une ValueError peut survenir avant la lecture de la réponse
+        body = b""
         try:
-            async with self.session.request(
-                method, url, auth=self.auth, params=params, timeout=aiohttp.ClientTimeout(total=10)
+            async with self._async_open(
+                method,
+                endpoint,
+                params=params,
+                data=data,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                command_lane=command_lane,
             ) as response:
                 response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as err:
+                body = await response.read()
+            result = body if raw else json.loads(body)
+        except aiohttp.ClientResponseError as err:
+            # L'appareil a répondu : ce n'est pas un problème de connectivité
+            self.instrumentation.record(
+                endpoint, time.monotonic() - start, error=True
+            )
+            self.breaker.record_success()
+            if err.status in UNSUPPORTED_HTTP_STATUSES:
+                _LOGGER.debug("Endpoint %s non supporté (HTTP %s)", url, err.status)
+                raise TwoNUnsupportedError(f"Endpoint non supporté: {endpoint}") from err
             _LOGGER.error("Erreur de connexion à %s: %s", url, err)
             raise UpdateFailed(f"Erreur de connexion: {err}") from err
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self.instrumentation.record(
+                endpoint,
+                time.monotonic() - start,
+                error=True,
+                timeout=isinstance(err, asyncio.TimeoutError),
+            )
+            was_closed = self.breaker.state == STATE_CLOSED
+            if not self.breaker.record_failure() and was_closed:
+                _LOGGER.warning("Erreur de connexion à %s: %s", url, err)
+            raise UpdateFailed(f"Erreur de connexion: {err!r}") from err
+        except ValueError as err:
+            # JSON invalide (aiohttp.InvalidURL, aussi ValueError, est traité plus haut)
+            self.instrumentation.record(
+                endpoint, time.monotonic() - start, len(body), error=True
+            )
+            self.breaker.record_success()
+            raise UpdateFailed(f"Réponse invalide de {endpoint}: {err}") from err
+        finally:
+            if probe:
+                self.breaker.end_probe()
+
+        self.instrumentation.record(endpoint, time.monotonic() - start, len(body))
+        self.breaker.record_success()
+        return result
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict | None = None,
+        timeout: float = 10,
+        data: bytes | None = None,
+        command_lane: bool = False,
+    ) -> dict:
+        """Effectue une requête HTTP vers l'API."""
+        result = await self._async_send(
+            method,
+            endpoint,
+            params=params,
+            data=data,
+            timeout=timeout,
+            command_lane=command_lane,
+        )
+        if result.get("success", True):
+            return result
+
+        # Une réponse d'erreur n'est jamais analysée comme un état
+        error = result.get("error") or {}
+        self.instrumentation.record_error(endpoint)
+        if error.get("code") in UNSUPPORTED_ERROR_CODES:
+            _LOGGER.debug("Endpoint %s non supporté: %s", endpoint, error)
+            raise TwoNUnsupportedError(f"Endpoint non supporté: {endpoint}")
+        raise TwoNApiError(f"Requête {endpoint} refusée: {error}")
 
     async def get_system_info(self) -> dict:
         """Récupère les informations système."""
@@ -107,52 +466,67 @@ class TwoNAPI:
         """Récupère les capacités des switches."""
         return await self._request("GET", "switch/caps")
 
-    async def get_switch_status(self) -> dict:
+    async def get_switch_status(self, command_lane: bool = False) -> dict:
         """Récupère le statut des switches."""
-        return await self._request("GET", "switch/status")
+        return await self._request("GET", "switch/status", command_lane=command_lane)
 
     async def control_switch(self, switch: int, action: str) -> dict:
         """Contrôle un switch (on/off/trigger)."""
         return await self._request(
-            "POST", "switch/ctrl", params={"switch": switch, "action": action}
+            "POST",
+            "switch/ctrl",
+            params={"switch": switch, "action": action},
+            command_lane=True,
         )
 
     async def get_io_caps(self) -> dict:
         """Récupère les capacités des entrées/sorties."""
         return await self._request("GET", "io/caps")
 
-    async def get_io_status(self) -> dict:
+    async def get_io_status(self, command_lane: bool = False) -> dict:
         """Récupère le statut des entrées/sorties."""
-        return await self._request("GET", "io/status")
+        return await self._request("GET", "io/status", command_lane=command_lane)
 
     async def control_io(self, port: int, action: str) -> dict:
         """Contrôle une sortie."""
         return await self._request(
-            "POST", "io/ctrl", params={"port": port, "action": action}
+            "POST",
+            "io/ctrl",
+            params={"port": port, "action": action},
+            command_lane=True,
         )
 
     async def get_camera_snapshot(self, width: int = 640, height: int = 480) -> bytes:
         """Récupère un snapshot de la caméra."""
-        url = f"{self.base_url}/camera/snapshot"
-        params = {"width": width, "height": height}
-        try:
-            async with self.session.get(
-                url, auth=self.auth, params=params, timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                response.raise_for_status()
-                return await response.read()
-        except aiohttp.ClientError as err:
-            _LOGGER.error("Erreur lors de la capture d'image: %s", err)
-            raise UpdateFailed(f"Erreur lors de la capture d'image: {err}") from err
-        try:
-            async with self.session.get(
-                url, auth=self.auth, params=params, timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                response.raise_for_status()
-                return await response.read()
-        except aiohttp.ClientError as err:
-            _LOGGER.error("Erreur lors de la capture d'image: %s", err)
-            raise
+        return await self._async_send(
+            "GET",
+            "camera/snapshot",
+            params={"width": width, "height": height},
+            raw=True,
+        )
+
+    async def get_camera_caps(self) -> dict:
+        """Récupère les résolutions de snapshot supportées par la caméra."""
+        return await self._request("GET", "camera/caps")
+
+    def open_mjpeg_stream(self, width: int, height: int, fps: int):
+        """Ouvre le flux MJPEG de la caméra (à utiliser avec async with)."""
+        if self.breaker.state != STATE_CLOSED:
+            raise TwoNCircuitOpenError(f"{self.host} injoignable, flux MJPEG refusé")
+        return self._async_open(
+            "GET",
+            "camera/snapshot",
+            params={"width": width, "height": height, "fps": fps},
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30),
+        )
+
+    @property
+    def rtsp_url(self) -> str:
+        """URL du flux RTSP H.264 de l'appareil."""
+        return (
+            f"rtsp://{quote(self.username, safe='')}:{quote(self.password, safe='')}"
+            f"@{self.host}:{RTSP_PORT}/h264_stream"
+        )
 
     async def get_call_status(self) -> dict:
         """Récupère le statut des appels."""
@@ -179,21 +553,56 @@ class TwoNAPI:
         params = {"text": text, **kwargs}
         return await self._request("POST", "display/text", params=params)
 
+    async def log_subscribe(
+        self, events: list[str], duration: int, include: str = "new"
+    ) -> int:
+        """Ouvre un canal d'abonnement au journal d'événements de l'appareil.
+
+        include vaut "new", "all" ou "-t" (événements des t dernières secondes).
+        """
+        response = await self._request(
+            "GET",
+            "log/subscribe",
+            params={
+                "filter": ",".join(events),
+                "duration": duration,
+                "include": include,
+            },
+        )
+        return response["result"]["id"]
+
+    async def log_pull(self, subscription_id: int, timeout: int) -> list[dict]:
+        """Attend (long polling) les nouveaux événements d'un abonnement."""
+        response = await self._request(
+            "GET",
+            "log/pull",
+            params={"id": subscription_id, "timeout": timeout},
+            timeout=timeout + 10,
+        )
+        if not response.get("success", True) or "result" not in response:
+            raise UpdateFailed(f"Abonnement {subscription_id} invalide: {response}")
+        return response["result"].get("events", [])
+
+    async def log_unsubscribe(self, subscription_id: int) -> dict:
+        """Ferme un canal d'abonnement au journal d'événements."""
+        return await self._request(
+            "GET", "log/unsubscribe", params={"id": subscription_id}
+        )
+
+    async def get_display_caps(self) -> dict:
+        """Récupère les caractéristiques des écrans (résolution)."""
+        return await self._request("GET", "display/caps")
+
     async def display_image(self, image_data: bytes) -> dict:
         """Affiche une image sur l'écran."""
-        url = f"{self.base_url}/display/image"
-        try:
-            async with self.session.post(
-                url, auth=self.auth, data=image_data, timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as err:
-            _LOGGER.error("Erreur lors de l'affichage de l'image: %s", err)
-            raise
+        return await self._request("POST", "display/image", data=image_data)
+
+    async def restart_system(self) -> dict:
+        """Redémarre l'appareil."""
+        return await self._request("POST", "system/restart")
 
 
-class TwoNDataUpdateCoordinator(DataUpdateCoordinator):
+class TwoNDataUpdateCoordinator(DataUpdateCoordinator[TwoNData]):
     """Coordinateur pour la mise à jour des données 2N."""
 
     def __init__(
@@ -201,6 +610,9 @@ class TwoNDataUpdateCoordinator(DataUpdateCoordinator):
         hass: HomeAssistant,
         api: TwoNAPI,
         update_interval: int,
+        scheduler: TwoNFleetScheduler,
+        key: str,
+        adaptive: bool = False,
     ) -> None:
         """Initialisation du coordinateur."""
         super().__init__(
@@ -210,62 +622,803 @@ class TwoNDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=update_interval),
         )
         self.api = api
+        self.scan_interval = timedelta(seconds=update_interval)
         self.system_info = {}
         self.capabilities = {}
+        self.last_cycle_duration: float | None = None
+        self.scheduler = scheduler
+        self.budget = scheduler.async_register(key, MAX_CONCURRENT_REQUESTS)
+        self.adaptive = adaptive
+        self._push_active = False
+        self._last_command = 0.0
+        self._last_fetch: dict[str, float] = {}
+        self._endpoint_states: dict[str, str] = {}
+        self.command_latency = LatencyWindow()
+        self.command_queue = TwoNCommandQueue(hass, api.host)
+        # File dédiée aux switches et sorties : jamais derrière l'affichage
+        self.control_queue = TwoNCommandQueue(hass, api.host, name="control")
+        self._unsupported_until: dict[str, float] = {}
+        # Détection de changements : dernier instantané notifié aux entités
+        self._notified_data: TwoNData | None = None
+        self._notified_success: bool | None = None
+        self.last_state_writes = 0
+        self.last_suppressed_writes = 0
+        self.suppressed_writes_total = 0
+        # Dernier instantané dont les transitions ont été émises
+        self._transition_data: TwoNData | None = None
+        self._device_id: str | None = None
+        self._transition_listeners: list[
+            Callable[[list[Transition], dict[str, Any]], None]
+        ] = []
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Mise à jour des données depuis l'API."""
-        try:
-            data = {}
-            
-            # Récupération des informations système
-            if not self.system_info:
-                self.system_info = await self.api.get_system_info()
-            
-            # Statut du système
-            data["system_status"] = await self.api.get_system_status()
-            
-            # Statut des switches
-            try:
-                if not self.capabilities.get("switches"):
-                    self.capabilities["switches"] = await self.api.get_switch_caps()
-                data["switches"] = await self.api.get_switch_status()
-            except Exception as err:
-                _LOGGER.debug("Switches non disponibles: %s", err)
-                data["switches"] = None
-            
-            # Statut des IO
-            try:
-                if not self.capabilities.get("io"):
-                    self.capabilities["io"] = await self.api.get_io_caps()
-                data["io"] = await self.api.get_io_status()
-            except Exception as err:
-                _LOGGER.debug("IO non disponibles: %s", err)
-                data["io"] = None
-            
-            # Statut des appels
-            try:
-                data["call"] = await self.api.get_call_status()
-            except Exception as err:
-                _LOGGER.debug("Statut d'appel non disponible: %s", err)
-                data["call"] = None
-            
-            # Statut du téléphone
-            try:
-                data["phone"] = await self.api.get_phone_status()
-            except Exception as err:
-                _LOGGER.debug("Statut téléphone non disponible: %s", err)
-                data["phone"] = None
-            
-            return data
-            
-        except Exception as err:
-            raise UpdateFailed(f"Erreur lors de la mise à jour des données: {err}") from err
+    @property
+    def queue_depth(self) -> int:
+        """Pic de requêtes en attente de l'appareil lors du dernier cycle."""
+        return self.budget.peak_waiting
+
+    @callback
+    def async_start_phase(self) -> None:
+        """Décale le prochain cycle selon la phase attribuée par l'ordonnanceur.
+
+        Seul le rafraîchissement planifié est retardé, par un intervalle
+        allongé une seule fois (il est recalculé à chaque cycle) ; les
+        rafraîchissements demandés (boutons, services) partent sans délai.
+        """
+        phase_delay = self.budget.phase * self.update_interval.total_seconds()
+        self.update_interval += timedelta(seconds=phase_delay)
+        self._async_reschedule()
+
+    @property
+    def base_interval(self) -> float:
+        """Intervalle de polling hors activité (réconciliation si flux actif)."""
+        if self._push_active:
+            return max(self.scan_interval.total_seconds(), RECONCILE_INTERVAL)
+        return self.scan_interval.total_seconds()
+
+    @property
+    def capability_map(self) -> dict[str, dict[str, Any]]:
+        """Capacités détectées pour chaque endpoint optionnel."""
+        now = time.monotonic()
+        return {
+            key: {
+                "state": self._endpoint_states.get(key, "unknown"),
+                "retry_in": (
+                    round(self._unsupported_until[key] - now)
+                    if key in self._unsupported_until
+                    else None
+                ),
+            }
+            for key in OPTIONAL_ENDPOINT_ERRORS
+        }
+
+    @property
+    def unsupported_endpoints(self) -> list[str]:
+        """Endpoints optionnels actuellement considérés comme non supportés."""
+        return sorted(self._unsupported_until)
+
+    @callback
+    def async_restore_unsupported(self, keys: list[str]) -> None:
+        """Restaure les endpoints non supportés mémorisés lors d'un démarrage précédent."""
+        retry_at = time.monotonic() + UNSUPPORTED_RETRY_INTERVAL
+        for key in keys:
+            if key in OPTIONAL_ENDPOINT_ERRORS:
+                self._endpoint_states[key] = "unsupported"
+                self._unsupported_until[key] = retry_at
+
+    def has_endpoint(self, key: str) -> bool:
+        """Retourne True si les entités d'un endpoint optionnel sont à créer.
+
+        Avant le premier cycle (démarrage depuis le cache), tout endpoint non
+        mémorisé comme non supporté est considéré présent.
+        """
+        if self.data is not None:
+            return getattr(self.data, key) is not None
+        return key not in self._unsupported_until
+
+    def _is_skipped(self, key: str, now: float) -> bool:
+        """Retourne True si l'endpoint est non supporté et pas encore à re-sonder."""
+        return now < self._unsupported_until.get(key, 0.0)
+
+    def _record_result(self, key: str, result: Any, now: float) -> None:
+        """Mémorise le résultat d'un endpoint optionnel (supporté ou non)."""
+        if isinstance(result, TwoNUnsupportedError):
+            if self._endpoint_states.get(key) != "unsupported":
+                _LOGGER.info(
+                    "Endpoint %s non supporté par %s, nouvel essai dans %s s",
+                    key,
+                    self.api.host,
+                    UNSUPPORTED_RETRY_INTERVAL,
+                )
+            self._endpoint_states[key] = "unsupported"
+            self._unsupported_until[key] = now + UNSUPPORTED_RETRY_INTERVAL
+        elif isinstance(result, BaseException):
+            if key in self._unsupported_until:
+                # Nouvel essai non concluant : prochain essai à l'échéance suivante
+                self._unsupported_until[key] = now + UNSUPPORTED_RETRY_INTERVAL
+                return
+            # Erreur passagère : l'endpoint reste interrogé à chaque cycle
+            self._endpoint_states.setdefault(key, "error")
+        else:
+            self._endpoint_states[key] = "supported"
+            self._unsupported_until.pop(key, None)
+
+    @staticmethod
+    def _call_active(data: TwoNData | None) -> bool:
+        """Retourne True si une session d'appel sonne ou est établie."""
+        return data is not None and data.call is not None and data.call.active
+
+    def _group_interval(
+        self, group: str, now: float, data: TwoNData | None
+    ) -> float:
+        """Cadence courante d'un groupe d'endpoints en mode adaptatif."""
+        base = self.base_interval
+        if group == "call" and not self._push_active and self._call_active(data):
+            return ADAPTIVE_FAST_INTERVAL
+        if group == "io" and now - self._last_command < ADAPTIVE_COMMAND_WINDOW:
+            return ADAPTIVE_FAST_INTERVAL
+        if group in ("system", "phone"):
+            return max(base, ADAPTIVE_SLOW_INTERVAL)
+        return base
+
+    def _due_groups(self, now: float) -> set[str]:
+        """Groupes d'endpoints à interroger lors de ce cycle."""
+        groups = set(POLL_GROUPS.values())
+        if not self.adaptive or self.data is None:
+            return groups
+        return {
+            group
+            for group in groups
+            if now - self._last_fetch.get(group, -math.inf)
+            >= self._group_interval(group, now, self.data) - ADAPTIVE_TOLERANCE
+        }
+
+    @callback
+    def _async_schedule_next_cycle(self, data: TwoNData | None = None) -> None:
+        """Règle l'intervalle jusqu'au prochain groupe dû."""
+        if not self.adaptive:
+            self.update_interval = timedelta(seconds=self.base_interval)
+            return
+        if data is None:
+            data = self.data
+        now = time.monotonic()
+        next_due = min(
+            self._last_fetch.get(group, now)
+            + self._group_interval(group, now, data)
+            - now
+            for group in set(POLL_GROUPS.values())
+        )
+        self.update_interval = timedelta(
+            seconds=max(next_due, ADAPTIVE_FAST_INTERVAL)
+        )
+
+    @callback
+    def _async_reschedule(self) -> None:
+        """Replanifie le rafraîchissement en attente avec l'intervalle courant.
+
+        Modifier update_interval ne déplace pas le rafraîchissement déjà
+        planifié par le DataUpdateCoordinator.
+        """
+        if not self._listeners:
+            return
+        self._unschedule_refresh()
+        self._schedule_refresh()
+
+    async def async_execute_command(
+        self, target: str, index: int | str, action: str
+    ) -> None:
+        """Exécute une commande de switch ou de sortie par la voie prioritaire.
+
+        La commande n'attend ni le polling en cours ni les écritures
+        d'affichage ou d'appel, seulement les commandes de switch et de
+        sortie qui la précèdent ; seul le statut concerné
+        (switch/status ou io/status) est relu pour confirmation, et la latence
+        appui → confirmation est mesurée.
+        """
+        start = time.monotonic()
+        self.async_note_command()
+        if target == "switch":
+            await self.control_queue.async_submit(
+                lambda: self.api.control_switch(index, action)
+            )
+            key, status = "switches", await self.api.get_switch_status(
+                command_lane=True
+            )
+        else:
+            await self.control_queue.async_submit(
+                lambda: self.api.control_io(index, action)
+            )
+            key, status = "io", await self.api.get_io_status(command_lane=True)
+
+        latency = time.monotonic() - start
+        self.command_latency.record(latency)
+        _LOGGER.debug(
+            "Commande %s %s %s confirmée en %.0f ms",
+            target,
+            index,
+            action,
+            latency * 1000,
+        )
+
+        if self.data is not None:
+            self.data = dataclasses.replace(self.data, **{key: PARSERS[key](status)})
+            self.async_update_listeners()
+
+    async def async_execute_commands(
+        self, commands: list[tuple[str, int | str, str]]
+    ) -> list[dict[str, Any]]:
+        """Exécute un lot de commandes de switch et de sortie.
+
+        Le lot occupe une seule place dans la file des switches et sorties ; ses
+        écritures partent en parallèle dans la limite des connexions de la
+        voie prioritaire, puis switch/status et io/status sont relus une seule
+        fois pour tout le lot. Retourne un résultat par commande.
+        """
+        start = time.monotonic()
+        self.async_note_command()
+        semaphore = asyncio.Semaphore(COMMAND_CONNECTIONS_PER_HOST)
+
+        async def _async_send(target: str, index: int | str, action: str) -> dict:
+            control = (
+                self.api.control_switch if target == "switch" else self.api.control_io
+            )
+            async with semaphore:
+                return await control(index, action)
+
+        async def _async_send_all() -> list[dict | BaseException]:
+            return await asyncio.gather(
+                *(_async_send(*command) for command in commands),
+                return_exceptions=True,
+            )
+
+        responses = await self.control_queue.async_submit(
+            _async_send_all, cost=len(commands)
+        )
+        results = []
+        for (target, index, action), response in zip(commands, responses):
+            error: str | None = None
+            if isinstance(response, BaseException):
+                error = str(response) or type(response).__name__
+            results.append(
+                {
+                    "target": target,
+                    "index": index,
+                    "action": action,
+                    "success": error is None,
+                    "error": error,
+                }
+            )
+
+        # Relecture groupée des seuls statuts concernés
+        fetchers = {
+            "switches": lambda: self.api.get_switch_status(command_lane=True),
+            "io": lambda: self.api.get_io_status(command_lane=True),
+        }
+        keys = sorted(
+            {"switches" if target == "switch" else "io" for target, _, _ in commands}
+        )
+        statuses = await asyncio.gather(
+            *(fetchers[key]() for key in keys), return_exceptions=True
+        )
+        updates = {
+            key: PARSERS[key](status)
+            for key, status in zip(keys, statuses)
+            if not isinstance(status, BaseException)
+        }
+
+        latency = time.monotonic() - start
+        self.command_latency.record(latency)
+        _LOGGER.debug(
+            "Lot de %s commande(s) sur %s confirmé en %.0f ms",
+            len(commands),
+            self.api.host,
+            latency * 1000,
+        )
+
+        if self.data is not None and updates:
+            self.data = dataclasses.replace(self.data, **updates)
+            self.async_update_listeners()
+        return results
+
+    @callback
+    def async_note_command(self) -> None:
+        """Signale une commande de switch/IO : cadence rapide des IO."""
+        self._last_command = time.monotonic()
+        if self.adaptive:
+            self._async_schedule_next_cycle()
+            # Sans replanification, la fenêtre rapide pourrait expirer avant
+            # le rafraîchissement déjà planifié
+            self._async_reschedule()
+
+    async def _async_limited(
+        self, request: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        """Exécute une requête dans les limites de l'appareil et de la flotte."""
+        async with self.scheduler.slot(self.budget):
+            return await request()
+
+    async def _async_fetch_system_info(self) -> dict:
+        """Récupère les informations système si elles ne sont pas connues."""
+        self.system_info = await self._async_limited(self.api.get_system_info)
+        return self.system_info
+
+    async def _async_fetch_switches(self) -> dict:
+        """Récupère les capacités (une seule fois) puis le statut des switches."""
+        if not self.capabilities.get("switches"):
+            self.capabilities["switches"] = await self._async_limited(
+                self.api.get_switch_caps
+            )
+        return await self._async_limited(self.api.get_switch_status)
+
+    async def _async_fetch_io(self) -> dict:
+        """Récupère les capacités (une seule fois) puis le statut des IO."""
+        if not self.capabilities.get("io"):
+            self.capabilities["io"] = await self._async_limited(self.api.get_io_caps)
+        return await self._async_limited(self.api.get_io_status)
+
+    async def _async_update_data(self) -> TwoNData:
+        """Mise à jour des données depuis l'API.
+
+        Les endpoints sont interrogés en parallèle (dans la limite de
+        MAX_CONCURRENT_REQUESTS par appareil et du budget de la flotte) ;
+        l'échec d'un endpoint optionnel n'affecte pas les autres.
+        """
+        start = time.monotonic()
+        self.budget.reset_peak()
+        due = self._due_groups(start)
+        fetchers: dict[str, Callable[[], Awaitable[dict]]] = {
+            key: fetch
+            for key, fetch in {
+                "system_status": lambda: self._async_limited(
+                    self.api.get_system_status
+                ),
+                "switches": self._async_fetch_switches,
+                "io": self._async_fetch_io,
+                "call": lambda: self._async_limited(self.api.get_call_status),
+                "phone": lambda: self._async_limited(self.api.get_phone_status),
+            }.items()
+            if POLL_GROUPS[key] in due and not self._is_skipped(key, start)
+        }
+        if not self.system_info:
+            fetchers["system_info"] = self._async_fetch_system_info
+
+        results = dict(
+            zip(
+                fetchers,
+                await asyncio.gather(
+                    *(fetch() for fetch in fetchers.values()), return_exceptions=True
+                ),
+            )
+        )
+
+        self.last_cycle_duration = time.monotonic() - start
+        _LOGGER.debug(
+            "Cycle de mise à jour de %s terminé en %.3f s",
+            self.api.host,
+            self.last_cycle_duration,
+        )
+
+        # Les informations et le statut système sont indispensables
+        for key in ("system_info", "system_status"):
+            err = results.get(key)
+            if isinstance(err, BaseException):
+                raise UpdateFailed(
+                    f"Erreur lors de la mise à jour des données: {err}"
+                ) from err
+
+        results.pop("system_info", None)
+        # Réponses analysées une seule fois ; les groupes non interrogés
+        # conservent leurs dernières données
+        updates: dict[str, Any] = {}
+        for key, result in results.items():
+            if key in OPTIONAL_ENDPOINT_ERRORS:
+                self._record_result(key, result, start)
+            if isinstance(result, BaseException):
+                _LOGGER.debug(OPTIONAL_ENDPOINT_ERRORS[key], result)
+                updates[key] = None
+            else:
+                updates[key] = PARSERS[key](result)
+        data = dataclasses.replace(self.data or TwoNData(), **updates)
+
+        for group in due:
+            self._last_fetch[group] = start
+        self._async_schedule_next_cycle(data)
+        return data
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notifie uniquement les listeners dont la valeur sélectionnée a changé.
+
+        Le contexte d'un listener peut être un sélecteur (voir models.py) : il
+        n'est alors appelé que si la valeur extraite diffère entre le dernier
+        instantané notifié et le nouveau. Les listeners sans sélecteur et les
+        changements de disponibilité sont toujours notifiés.
+        """
+        previous, self._notified_data = self._notified_data, self.data
+        if self._transition_data is not None and self.data is not None:
+            self._async_fire_transitions(self._transition_data, self.data)
+        self._transition_data = self.data
+        availability_changed = self._notified_success != self.last_update_success
+        self._notified_success = self.last_update_success
+        compare = (
+            not availability_changed
+            and previous is not None
+            and self.data is not None
+        )
+
+        written = suppressed = 0
+        for update_callback, selector in list(self._listeners.values()):
+            if compare and callable(selector):
+                if selector(previous) == selector(self.data):
+                    suppressed += 1
+                    continue
+            update_callback()
+            written += 1
+
+        self.last_state_writes = written
+        self.last_suppressed_writes = suppressed
+        self.suppressed_writes_total += suppressed
+        if suppressed:
+            _LOGGER.debug(
+                "%s: %s mise(s) à jour d'état, %s ignorée(s) (inchangées)",
+                self.api.host,
+                written,
+                suppressed,
+            )
+
+    @callback
+    def _async_fire_transitions(
+        self,
+        previous: TwoNData,
+        current: TwoNData,
+        event_time: int | None = None,
+    ) -> None:
+        """Émet un événement twon_intercom_* pour chaque transition réelle.
+
+        event_time est l'horodatage appareil (utcTime) de l'événement du
+        journal à l'origine du changement ; à défaut, l'heure système lue,
+        extrapolée jusqu'à maintenant (system/status peut dater de plusieurs
+        minutes en mode push ou adaptatif).
+        """
+        port_types = {
+            port.get("port"): port.get("type")
+            for port in self.capabilities.get("io", {})
+            .get("result", {})
+            .get("ports", [])
+        }
+        transitions = diff_transitions(previous, current, port_types)
+        if not transitions:
+            return
+
+        serial = self.system_info.get("result", {}).get("serialNumber", "unknown")
+        if self._device_id is None:
+            device = dr.async_get(self.hass).async_get_device(
+                identifiers={(DOMAIN, serial)}
+            )
+            self._device_id = device.id if device else None
+        time_source = TIME_SOURCE_LOG
+        if event_time is None:
+            time_source = TIME_SOURCE_ESTIMATED
+            if current.system_status is not None:
+                event_time = current.system_status.estimated_time()
+        base = {
+            "device_id": self._device_id,
+            "serial": serial,
+            "host": self.api.host,
+            "device_time": event_time,
+            "time_source": time_source,
+        }
+        for event_type, details in transitions:
+            self.hass.bus.async_fire(event_type, {**base, **details})
+        for listener in self._transition_listeners:
+            listener(transitions, base)
+
+    @callback
+    def async_add_transition_listener(
+        self, listener: Callable[[list[Transition], dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        """Abonne un callback aux transitions d'état de l'appareil."""
+        self._transition_listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            self._transition_listeners.remove(listener)
+
+        return _remove
+
+    @property
+    def change_detection(self) -> dict[str, int]:
+        """Compteurs de la détection de changements."""
+        return {
+            "last_state_writes": self.last_state_writes,
+            "last_suppressed_writes": self.last_suppressed_writes,
+            "suppressed_writes_total": self.suppressed_writes_total,
+        }
+
+    @callback
+    def async_set_push_active(self, active: bool) -> None:
+        """Adapte l'intervalle de polling selon l'état du flux d'événements."""
+        self._push_active = active
+        self._async_schedule_next_cycle()
+        if active:
+            self._async_reschedule()
+        else:
+            # Flux perdu : reprise immédiate du polling
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_apply_events(self, events: list[dict[str, Any]]) -> None:
+        """Applique les événements de l'appareil aux données du coordinateur."""
+        if self.data is None:
+            return
+
+        # Les objets d'état sont immuables : seuls ceux modifiés sont recréés.
+        # Les transitions sont calculées événement par événement, pour qu'une
+        # sonnerie suivie d'un raccroché dans le même lot reste visible.
+        data = self.data
+        for event in events:
+            name = event.get("event")
+            params = event.get("params", {})
+            if name == "CallStateChanged":
+                updated = _apply_call_event(data, params)
+            elif name in ("InputChanged", "OutputChanged"):
+                updated = _apply_io_event(data, params)
+            elif name == "SwitchStateChanged":
+                updated = _apply_switch_event(data, params)
+            else:
+                continue
+            if updated is not data:
+                self._async_fire_transitions(data, updated, event.get("utcTime"))
+                data = updated
+
+        if data is not self.data:
+            self._transition_data = data
+            self.async_set_updated_data(data)
+
+
+def _apply_call_event(data: TwoNData, params: dict[str, Any]) -> TwoNData:
+    """Met à jour les sessions d'appel à partir d'un événement CallStateChanged."""
+    if data.call is None:
+        return data
+    return dataclasses.replace(
+        data,
+        call=data.call.with_event(
+            params.get("session"), params.get("state"), params.get("direction")
+        ),
+    )
+
+
+def _apply_io_event(data: TwoNData, params: dict[str, Any]) -> TwoNData:
+    """Met à jour l'état d'un port IO à partir d'un événement Input/OutputChanged."""
+    if data.io is None:
+        return data
+    io = data.io.with_port(params.get("port"), bool(params.get("state")))
+    return data if io is None else dataclasses.replace(data, io=io)
+
+
+def _apply_switch_event(data: TwoNData, params: dict[str, Any]) -> TwoNData:
+    """Met à jour l'état d'un switch à partir d'un événement SwitchStateChanged."""
+    if data.switches is None:
+        return data
+    switches = data.switches.with_switch(
+        params.get("switch"), bool(params.get("state"))
+    )
+    return data if switches is None else dataclasses.replace(data, switches=switches)
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Configuration du composant via configuration.yaml."""
     hass.data.setdefault(DOMAIN, {})
+
+    async def async_save_burst(call: ServiceCall) -> ServiceResponse:
+        """Enregistre les images pré-capturées des appareils ciblés."""
+        directory = call.data[ATTR_DIRECTORY]
+        if not hass.config.is_allowed_path(directory):
+            raise HomeAssistantError(f"Dossier non autorisé: {directory}")
+
+        files: list[str] = []
+        for entry_data in await _async_get_targeted_entries(hass, call):
+            serial = entry_data["coordinator"].system_info.get("result", {}).get(
+                "serialNumber", "unknown"
+            )
+            files.extend(
+                await entry_data["precapture"].async_save(
+                    directory, serial, call.data[ATTR_BEST_ONLY]
+                )
+            )
+        return {"files": files}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SAVE_BURST,
+        async_save_burst,
+        schema=SAVE_BURST_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Interroge l'historique des appels et ouvertures des appareils ciblés."""
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        limit = call.data.get(ATTR_LIMIT)
+        # Sans cible, l'historique de tous les appareils est retourné
+        entries = await _async_get_targeted_entries(hass, call) or list(
+            hass.data[DOMAIN].values()
+        )
+
+        records: list[dict[str, Any]] = []
+        for entry_data in entries:
+            serial = entry_data["coordinator"].system_info.get("result", {}).get(
+                "serialNumber", "unknown"
+            )
+            records.extend(
+                {**record, "serial": serial}
+                for record in entry_data["history"].query(
+                    start and dt_util.as_utc(start),
+                    end and dt_util.as_utc(end),
+                    call.data.get(ATTR_TYPE),
+                    limit,
+                )
+            )
+        records.sort(key=lambda record: record["time"], reverse=True)
+        return {"records": records[:limit]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_dial(call: ServiceCall) -> None:
+        """Compose un numéro depuis les appareils ciblés."""
+        number = call.data[ATTR_NUMBER]
+        await _async_fan_out(
+            await _async_get_command_entries(hass, call),
+            lambda entry_data: entry_data["coordinator"].command_queue.async_submit(
+                lambda: entry_data["api"].dial_call(number)
+            ),
+        )
+
+    async def async_display_text(call: ServiceCall) -> None:
+        """Affiche un texte sur l'écran des appareils ciblés."""
+        text = call.data[ATTR_TEXT]
+        options = {
+            key: call.data[key] for key in DISPLAY_TEXT_OPTIONS if key in call.data
+        }
+        await _async_fan_out(
+            await _async_get_command_entries(hass, call),
+            lambda entry_data: entry_data["display"].async_show_text(
+                text, options, call.data[ATTR_FORCE]
+            ),
+        )
+
+    async def async_display_image(call: ServiceCall) -> None:
+        """Affiche une image sur l'écran des appareils ciblés."""
+        path = call.data[ATTR_PATH]
+        if not hass.config.is_allowed_path(path):
+            raise HomeAssistantError(f"Fichier non autorisé: {path}")
+
+        def _read() -> bytes:
+            with open(path, "rb") as file:
+                return file.read()
+
+        try:
+            image = await hass.async_add_executor_job(_read)
+        except OSError as err:
+            raise HomeAssistantError(f"Lecture de {path} impossible: {err}") from err
+
+        await _async_fan_out(
+            await _async_get_command_entries(hass, call),
+            lambda entry_data: entry_data["display"].async_show_image(
+                image, call.data[ATTR_FORCE]
+            ),
+        )
+
+    async def async_trigger_switch(call: ServiceCall) -> None:
+        """Active un switch des appareils ciblés (impulsion)."""
+        switch = call.data[ATTR_SWITCH_NUM]
+        duration = call.data.get(ATTR_DURATION)
+
+        async def _async_trigger(entry_data: dict[str, Any]) -> None:
+            coordinator: TwoNDataUpdateCoordinator = entry_data["coordinator"]
+            if duration is None:
+                # Impulsion de la durée configurée sur l'appareil
+                await coordinator.async_execute_command("switch", switch, "trigger")
+                return
+            await coordinator.async_execute_command("switch", switch, "on")
+            await asyncio.sleep(duration / 1000)
+            await coordinator.async_execute_command("switch", switch, "off")
+
+        await _async_fan_out(
+            await _async_get_command_entries(hass, call), _async_trigger
+        )
+
+    async def async_bulk_control(call: ServiceCall) -> ServiceResponse:
+        """Commande plusieurs switches et sorties, sur un ou plusieurs appareils."""
+        # Un lot par config entry (plusieurs entrées peuvent partager un hôte)
+        batches: dict[
+            TwoNDataUpdateCoordinator, tuple[dict[str, Any], list]
+        ] = {}
+        targeted: list[dict[str, Any]] | None = None
+        for item in call.data[ATTR_COMMANDS]:
+            if ATTR_SWITCH_NUM in item:
+                command = ("switch", item[ATTR_SWITCH_NUM], item[ATTR_ACTION])
+            else:
+                command = ("io", item[ATTR_PORT], item[ATTR_ACTION])
+            if ATTR_DEVICE_ID in item:
+                entries = [_entry_data_for_device(hass, item[ATTR_DEVICE_ID])]
+            else:
+                # Sans appareil précisé, la commande vise les appareils ciblés
+                if targeted is None:
+                    targeted = await _async_get_command_entries(hass, call)
+                entries = targeted
+            for entry_data in entries:
+                _, commands = batches.setdefault(
+                    entry_data["coordinator"], (entry_data, [])
+                )
+                commands.append(command)
+
+        outcomes = await asyncio.gather(
+            *(
+                entry_data["coordinator"].async_execute_commands(commands)
+                for entry_data, commands in batches.values()
+            ),
+            return_exceptions=True,
+        )
+
+        results: list[dict[str, Any]] = []
+        for (entry_data, commands), outcome in zip(batches.values(), outcomes):
+            serial = entry_data["coordinator"].system_info.get("result", {}).get(
+                "serialNumber", "unknown"
+            )
+            if isinstance(outcome, BaseException):
+                # Lot entier en échec (file de l'appareil arrêtée)
+                outcome = [
+                    {
+                        "target": target,
+                        "index": index,
+                        "action": action,
+                        "success": False,
+                        "error": str(outcome) or type(outcome).__name__,
+                    }
+                    for target, index, action in commands
+                ]
+            results.extend(
+                {"serial": serial, "host": entry_data["api"].host, **result}
+                for result in outcome
+            )
+
+        if not call.return_response:
+            failures = [
+                f"{result['host']} {result['target']} {result['index']}: "
+                f"{result['error']}"
+                for result in results
+                if not result["success"]
+            ]
+            if failures:
+                raise HomeAssistantError(
+                    f"{len(failures)}/{len(results)} commande(s) en échec: "
+                    f"{'; '.join(failures)}"
+                )
+            return None
+        return {"results": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_CONTROL,
+        async_bulk_control,
+        schema=BULK_CONTROL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    for service, handler, schema in (
+        (SERVICE_DIAL, async_dial, DIAL_SCHEMA),
+        (SERVICE_DISPLAY_TEXT, async_display_text, DISPLAY_TEXT_SCHEMA),
+        (SERVICE_DISPLAY_IMAGE, async_display_image, DISPLAY_IMAGE_SCHEMA),
+        (SERVICE_TRIGGER_SWITCH, async_trigger_switch, TRIGGER_SWITCH_SCHEMA),
+    ):
+        hass.services.async_register(DOMAIN, service, handler, schema=schema)
     
     if DOMAIN in config:
         hass.async_create_task(
@@ -277,42 +1430,349 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     return True
 
 
+def async_create_device_session(
+    use_ssl: bool,
+    verify_ssl: bool,
+    limit_per_host: int = CONNECTIONS_PER_HOST,
+) -> aiohttp.ClientSession:
+    """Crée une session dédiée à un appareil avec son propre pool keep-alive.
+
+    Les connexions (et donc les sessions TLS) sont réutilisées d'une requête
+    à l'autre ; les certificats auto-signés des appareils 2N sont acceptés
+    lorsque la vérification est désactivée.
+    """
+    ssl_context: ssl.SSLContext | bool = False
+    if use_ssl:
+        ssl_context = (
+            get_default_context() if verify_ssl else get_default_no_verify_context()
+        )
+    connector = aiohttp.TCPConnector(
+        limit_per_host=limit_per_host,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ssl=ssl_context,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def _async_get_targeted_entries(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[dict[str, Any]]:
+    """Retourne les données des config entries visées par un appel de service."""
+    entry_ids = await async_extract_config_entry_ids(hass, call)
+    return [
+        hass.data[DOMAIN][entry_id]
+        for entry_id in entry_ids
+        if entry_id in hass.data[DOMAIN]
+    ]
+
+
+async def _async_get_command_entries(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[dict[str, Any]]:
+    """Retourne les appareils visés par une commande.
+
+    Sans cible, l'appareil est implicite lorsqu'un seul est configuré.
+    """
+    entries = await _async_get_targeted_entries(hass, call)
+    if entries:
+        return entries
+    if len(hass.data[DOMAIN]) == 1:
+        return list(hass.data[DOMAIN].values())
+    raise HomeAssistantError(
+        f"Aucun appareil ciblé pour {DOMAIN}.{call.service}"
+    )
+
+
+def _entry_data_for_device(hass: HomeAssistant, device_id: str) -> dict[str, Any]:
+    """Retourne les données de la config entry d'un appareil du registre."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is not None:
+        for entry_id in device.config_entries:
+            if entry_id in hass.data[DOMAIN]:
+                return hass.data[DOMAIN][entry_id]
+    raise HomeAssistantError(f"Appareil {DOMAIN} inconnu: {device_id}")
+
+
+async def _async_fan_out(
+    entries: list[dict[str, Any]],
+    command: Callable[[dict[str, Any]], Awaitable[Any]],
+) -> None:
+    """Exécute une commande sur tous les appareils en parallèle.
+
+    Chaque appareil reste sérialisé par sa propre file de commandes ; un
+    appareil en échec n'empêche pas les autres d'être commandés.
+    """
+    results = await asyncio.gather(
+        *(command(entry_data) for entry_data in entries),
+        return_exceptions=True,
+    )
+    failures = [
+        f"{entry_data['api'].host}: {result}"
+        for entry_data, result in zip(entries, results)
+        if isinstance(result, BaseException)
+    ]
+    if failures:
+        raise HomeAssistantError(
+            f"Commande en échec sur {len(failures)}/{len(entries)} "
+            f"appareil(s): {'; '.join(failures)}"
+        )
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Configuration du composant via config entry."""
     host = entry.data[CONF_HOST]
     username = entry.data[CONF_USERNAME]
     password = entry.data[CONF_PASSWORD]
     port = entry.data.get(CONF_PORT, DEFAULT_PORT)
-    scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    scan_interval = entry.options.get(
+        CONF_SCAN_INTERVAL, entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    )
+    snapshot_ttl = entry.options.get(CONF_SNAPSHOT_TTL, DEFAULT_SNAPSHOT_TTL)
+    adaptive = entry.options.get(CONF_ADAPTIVE_POLLING, False)
     
-    session = async_get_clientsession(hass)
-    api = TwoNAPI(host, username, password, port, session)
+    use_ssl = entry.data.get(CONF_SSL, False)
     
-    # Vérification de la connexion
-    try:
-        await api.get_system_info()
-    except Exception as err:
-        _LOGGER.error("Impossible de se connecter à %s: %s", host, err)
-        return False
+    verify_ssl = entry.data.get(CONF_VERIFY_SSL, False)
+    session = async_create_device_session(use_ssl, verify_ssl)
+    command_session = async_create_device_session(
+        use_ssl, verify_ssl, COMMAND_CONNECTIONS_PER_HOST
+    )
+    api = TwoNAPI(
+        host,
+        username,
+        password,
+        port,
+        session,
+        entry.data.get(CONF_AUTH_METHOD, AUTH_BASIC),
+        use_ssl,
+        command_session,
+    )
     
-    coordinator = TwoNDataUpdateCoordinator(hass, api, scan_interval)
-    await coordinator.async_config_entry_first_refresh()
+    scheduler: TwoNFleetScheduler = hass.data.setdefault(
+        DATA_FLEET, TwoNFleetScheduler()
+    )
+    coordinator = TwoNDataUpdateCoordinator(
+        hass, api, scan_interval, scheduler, entry.entry_id, adaptive
+    )
+
+    async def _async_abort_setup() -> None:
+        """Libère les ressources d'une configuration interrompue."""
+        scheduler.async_unregister(entry.entry_id)
+        await session.close()
+        await command_session.close()
+
+    # Les métadonnées en cache évitent system/info, switch/caps et io/caps au démarrage
+    store: Store[dict[str, Any]] = Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+    )
+    cached = await store.async_load() or {}
+    from_cache = bool(cached.get("system_info"))
+    if from_cache:
+        coordinator.system_info = cached["system_info"]
+        coordinator.capabilities = dict(cached.get("capabilities", {}))
+        coordinator.async_restore_unsupported(cached.get("unsupported", []))
+        # Entités créées depuis le cache, indisponibles jusqu'au premier cycle
+        coordinator.last_update_success = False
+    else:
+        # Vérification de la connexion
+        try:
+            coordinator.system_info = await api.get_system_info()
+        except Exception as err:
+            _LOGGER.error("Impossible de se connecter à %s: %s", host, err)
+            await _async_abort_setup()
+            return False
+
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await _async_abort_setup()
+            raise
+        coordinator.async_start_phase()
+        await store.async_save(_metadata_for(coordinator))
+
+    # Curseur du flux d'événements : reprise sans perte ni doublon
+    event_store: Store[dict[str, Any]] = Store(
+        hass, STORAGE_VERSION, _event_store_key(entry)
+    )
+    event_stream = TwoNEventStream(
+        hass,
+        api,
+        coordinator.async_apply_events,
+        coordinator.async_set_push_active,
+        event_store,
+        await event_store.async_load(),
+    )
+
+    snapshot_cache = SnapshotCache(
+        hass, api.get_camera_snapshot, snapshot_ttl, api.get_camera_caps
+    )
+    precapture = PreCaptureBuffer(hass, coordinator, snapshot_cache)
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            precapture.async_handle_coordinator_update, select_ringing
+        )
+    )
     
+    history = DeviceHistory(hass, _history_path(hass, entry))
+    await history.async_load()
+    entry.async_on_unload(
+        coordinator.async_add_transition_listener(history.async_handle_transitions)
+    )
+
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
         "coordinator": coordinator,
+        "event_stream": event_stream,
+        "snapshot_cache": snapshot_cache,
+        "mjpeg_stream": MjpegBroadcaster(hass, api),
+        "precapture": precapture,
+        "display": DisplayContentCache(hass, coordinator),
+        "history": history,
     }
+
+    async def _async_close_sessions(_: Event) -> None:
+        """Ferme les sessions de l'appareil à l'arrêt de Home Assistant."""
+        await session.close()
+        await command_session.close()
+
+    # L'arrêt de Home Assistant ne décharge pas les entries : sans ce
+    # listener, les connexions keep-alive resteraient ouvertes
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_sessions)
+    )
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if from_cache:
+        # Premier cycle en arrière-plan : un appareil hors ligne ne bloque pas
+        # le démarrage
+        entry.async_create_background_task(
+            hass,
+            _async_first_cycle(hass, entry, coordinator, store, cached),
+            f"twon_intercom_first_cycle_{host}",
+        )
+    _async_start_event_stream(entry, coordinator, event_stream)
     
     return True
 
 
+def _event_store_key(entry: ConfigEntry) -> str:
+    """Clé de stockage du curseur du flux d'événements d'une config entry."""
+    return f"{DOMAIN}.{entry.entry_id}.events"
+
+
+def _history_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Fichier JSON Lines de l'historique d'une config entry."""
+    return hass.config.path(".storage", f"{DOMAIN}.{entry.entry_id}.history.jsonl")
+
+
+async def _async_first_cycle(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: TwoNDataUpdateCoordinator,
+    store: Store[dict[str, Any]],
+    cached: dict[str, Any],
+) -> None:
+    """Premier cycle d'un démarrage depuis le cache, puis revalidation."""
+    await coordinator.async_refresh()
+    coordinator.async_start_phase()
+    metadata = _metadata_for(coordinator)
+    if metadata != cached:
+        await store.async_save(metadata)
+    await _async_revalidate_metadata(hass, entry, coordinator, store)
+
+
+@callback
+def _async_start_event_stream(
+    entry: ConfigEntry,
+    coordinator: TwoNDataUpdateCoordinator,
+    event_stream: TwoNEventStream,
+) -> None:
+    """Démarre le flux d'événements dès que les premières données sont connues.
+
+    Les événements rattrapés ne peuvent être appliqués qu'à un état initial.
+    """
+    if coordinator.data is not None:
+        event_stream.async_start()
+        return
+
+    @callback
+    def _async_on_update() -> None:
+        if coordinator.data is not None and not event_stream.started:
+            event_stream.async_start()
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_on_update))
+
+
+def _metadata_for(coordinator: TwoNDataUpdateCoordinator) -> dict[str, Any]:
+    """Métadonnées de l'appareil à conserver entre deux démarrages."""
+    return {
+        "system_info": coordinator.system_info,
+        "capabilities": coordinator.capabilities,
+        "unsupported": coordinator.unsupported_endpoints,
+    }
+
+
+async def _async_revalidate_metadata(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: TwoNDataUpdateCoordinator,
+    store: Store[dict[str, Any]],
+) -> None:
+    """Revalide en arrière-plan les métadonnées chargées depuis le cache."""
+    try:
+        system_info = await coordinator.api.get_system_info()
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug(
+            "Revalidation des métadonnées de %s impossible: %s",
+            coordinator.api.host,
+            err,
+        )
+        return
+
+    cached_version = coordinator.system_info.get("result", {}).get("swVersion")
+    coordinator.system_info = system_info
+    if system_info.get("result", {}).get("swVersion") == cached_version:
+        await store.async_save(_metadata_for(coordinator))
+        return
+
+    # Nouveau firmware : les capacités sont redécouvertes au rechargement
+    _LOGGER.info(
+        "Nouveau firmware détecté sur %s, rechargement de l'intégration",
+        coordinator.api.host,
+    )
+    await store.async_save(
+        {"system_info": system_info, "capabilities": {}, "unsupported": []}
+    )
+    hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Rechargement du composant après modification des options."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Suppression des métadonnées en cache, du curseur et de l'historique."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await Store(hass, STORAGE_VERSION, _event_store_key(entry)).async_remove()
+    await DeviceHistory(hass, _history_path(hass, entry)).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Déchargement du composant."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["event_stream"].async_stop()
+        await data["mjpeg_stream"].async_stop()
+        await data["precapture"].async_stop()
+        await data["coordinator"].command_queue.async_stop()
+        await data["coordinator"].control_queue.async_stop()
+        data["coordinator"].scheduler.async_unregister(entry.entry_id)
+        await data["api"].session.close()
+        await data["api"].command_session.close()
     
     return unload_ok
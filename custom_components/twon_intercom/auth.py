@@ -0,0 +1,102 @@
+"""
+Authentification HTTP Digest pour l'intégration 2N Intercom.
+Fichier: custom_components/twon_intercom/auth.py
+
+Le nonce fourni par l'appareil est conservé et réutilisé (avec un compteur
+nc incrémenté) : seul le premier appel, ou un nonce expiré, coûte un aller-
+retour 401 supplémentaire.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+
+AUTH_BASIC = "basic"
+AUTH_DIGEST = "digest"
+
+_CHALLENGE_PARAM = re.compile(r'(\w+)=(?:"([^"]*)"|([^\s,]+))')
+
+_HASHES = {
+    "MD5": hashlib.md5,
+    "MD5-SESS": hashlib.md5,
+    "SHA-256": hashlib.sha256,
+    "SHA-256-SESS": hashlib.sha256,
+}
+
+
+class DigestAuth:
+    """Générateur d'en-têtes Authorization Digest avec réutilisation du nonce."""
+
+    def __init__(self, username: str, password: str) -> None:
+        """Initialisation de l'authentification Digest."""
+        self._username = username
+        self._password = password
+        self._challenge: dict[str, str] = {}
+        self._nonce_count = 0
+
+    @property
+    def challenged(self) -> bool:
+        """Retourne True si un nonce est disponible."""
+        return "nonce" in self._challenge
+
+    def parse_challenge(self, header: str) -> bool:
+        """Mémorise le challenge d'un en-tête WWW-Authenticate Digest."""
+        scheme, _, params = header.partition(" ")
+        if scheme.lower() != "digest":
+            return False
+        challenge = {
+            key.lower(): quoted if quoted else plain
+            for key, quoted, plain in _CHALLENGE_PARAM.findall(params)
+        }
+        if "nonce" not in challenge or "realm" not in challenge:
+            return False
+        algorithm = challenge.get("algorithm", "MD5").upper()
+        if algorithm not in _HASHES:
+            return False
+        self._challenge = challenge
+        self._nonce_count = 0
+        return True
+
+    def authorization(self, method: str, path: str) -> str | None:
+        """Construit l'en-tête Authorization pour une requête."""
+        if not self.challenged:
+            return None
+
+        challenge = self._challenge
+        algorithm = challenge.get("algorithm", "MD5").upper()
+        hash_func = _HASHES[algorithm]
+
+        def _hash(value: str) -> str:
+            return hash_func(value.encode()).hexdigest()
+
+        self._nonce_count += 1
+        nonce = challenge["nonce"]
+        nc = f"{self._nonce_count:08x}"
+        cnonce = os.urandom(8).hex()
+
+        ha1 = _hash(f"{self._username}:{challenge['realm']}:{self._password}")
+        if algorithm.endswith("-SESS"):
+            ha1 = _hash(f"{ha1}:{nonce}:{cnonce}")
+        ha2 = _hash(f"{method}:{path}")
+
+        qop_options = [
+            qop.strip() for qop in challenge.get("qop", "").split(",") if qop.strip()
+        ]
+        fields = {
+            "username": f'"{self._username}"',
+            "realm": f'"{challenge["realm"]}"',
+            "nonce": f'"{nonce}"',
+            "uri": f'"{path}"',
+            "algorithm": algorithm,
+        }
+        if "auth" in qop_options:
+            fields["response"] = f'"{_hash(f"{ha1}:{nonce}:{nc}:{cnonce}:auth:{ha2}")}"'
+            fields.update(qop="auth", nc=nc, cnonce=f'"{cnonce}"')
+        else:
+            fields["response"] = f'"{_hash(f"{ha1}:{nonce}:{ha2}")}"'
+        if "opaque" in challenge:
+            fields["opaque"] = f'"{challenge["opaque"]}"'
+
+        return "Digest " + ", ".join(f"{key}={value}" for key, value in fields.items())
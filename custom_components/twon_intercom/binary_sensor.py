@@ -5,13 +5,19 @@ Fichier: custom_components/2n_intercom/binary_sensor.py
 
 import logging
 
-from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import DOMAIN, TwoNDataUpdateCoordinator
+from .breaker import STATE_CLOSED
+from .models import select_call_active, select_io_port
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,10 +32,10 @@ async def async_setup_entry(
         "coordinator"
     ]
 
-    sensors = []
+    sensors = [TwoNConnectivitySensor(coordinator)]
 
     # Ajout des entrées IO comme binary sensors
-    if coordinator.data.get("io"):
+    if coordinator.has_endpoint("io"):
         io_caps = coordinator.capabilities.get("io", {})
         ports = io_caps.get("result", {}).get("ports", [])
         
@@ -38,7 +44,7 @@ async def async_setup_entry(
                 sensors.append(TwoNInputSensor(coordinator, port.get("port")))
 
     # Ajout d'un binary sensor pour l'état d'appel
-    if coordinator.data.get("call"):
+    if coordinator.has_endpoint("call"):
         sensors.append(TwoNCallSensor(coordinator))
 
     async_add_entities(sensors)
@@ -53,7 +59,7 @@ class TwoNInputSensor(CoordinatorEntity, BinarySensorEntity):
         port: int,
     ) -> None:
         """Initialisation de l'entrée."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=select_io_port(port))
         self._port = port
         self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_input_{port}"
         self._attr_name = f"Input {port}"
@@ -73,12 +79,8 @@ class TwoNInputSensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         """Retourne True si l'entrée est active."""
-        io_data = self.coordinator.data.get("io", {})
-        ports = io_data.get("result", {}).get("ports", [])
-        for port in ports:
-            if port.get("port") == self._port:
-                return port.get("state") == "active"
-        return False
+        io = self.coordinator.data.io
+        return io is not None and io.is_active(self._port)
 
 
 class TwoNCallSensor(CoordinatorEntity, BinarySensorEntity):
@@ -89,7 +91,7 @@ class TwoNCallSensor(CoordinatorEntity, BinarySensorEntity):
         coordinator: TwoNDataUpdateCoordinator,
     ) -> None:
         """Initialisation du sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=select_call_active)
         self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_call_active"
         self._attr_name = "Call Active"
 
@@ -108,9 +110,47 @@ class TwoNCallSensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         """Retourne True si un appel est en cours."""
-        call_data = self.coordinator.data.get("call", {})
-        sessions = call_data.get("result", {}).get("sessions", [])
-        return any(
-            session.get("state") in ["ringing", "connected"]
-            for session in sessions
-        )
+        call = self.coordinator.data.call
+        return call is not None and call.active
+
+
+class TwoNConnectivitySensor(CoordinatorEntity, BinarySensorEntity):
+    """Représentation de la connectivité de l'API 2N (disjoncteur)."""
+
+    def __init__(
+        self,
+        coordinator: TwoNDataUpdateCoordinator,
+    ) -> None:
+        """Initialisation du sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_api_connectivity"
+        self._attr_name = "API Connectivity"
+        self._attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def device_info(self):
+        """Informations du device."""
+        system_info = self.coordinator.system_info.get("result", {})
+        return {
+            "identifiers": {(DOMAIN, system_info.get("serialNumber", "unknown"))},
+            "name": f"2N {system_info.get('variant', 'Intercom')}",
+            "manufacturer": "2N",
+            "model": system_info.get("variant", "Unknown"),
+            "sw_version": system_info.get("swVersion", "Unknown"),
+        }
+
+    @property
+    def available(self) -> bool:
+        """Le sensor reste disponible pour signaler un appareil injoignable."""
+        return True
+
+    @property
+    def is_on(self) -> bool:
+        """Retourne True si le circuit est fermé (appareil joignable)."""
+        return self.coordinator.api.breaker.state == STATE_CLOSED
+
+    @property
+    def extra_state_attributes(self):
+        """Retourne l'état du disjoncteur."""
+        return self.coordinator.api.breaker.attributes
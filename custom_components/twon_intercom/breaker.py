@@ -0,0 +1,119 @@
+"""
+Disjoncteur (circuit breaker) des requêtes vers un appareil 2N.
+Fichier: custom_components/twon_intercom/breaker.py
+
+Après plusieurs échecs de connexion consécutifs, le circuit s'ouvre : les
+requêtes échouent immédiatement au lieu d'attendre le timeout. Une requête
+de test est autorisée après un délai qui double à chaque échec.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Nombre d'échecs consécutifs avant l'ouverture du circuit
+FAILURE_THRESHOLD = 3
+
+# Délai avant la requête de test, doublé à chaque échec (secondes)
+BACKOFF_MIN = 5
+BACKOFF_MAX = 300
+
+
+class TwoNCircuitOpenError(UpdateFailed):
+    """Requête refusée sans contacter l'appareil (circuit ouvert)."""
+
+
+class CircuitBreaker:
+    """Disjoncteur fermé / ouvert / semi-ouvert d'un appareil."""
+
+    def __init__(self, host: str) -> None:
+        """Initialisation du disjoncteur."""
+        self._host = host
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.backoff = BACKOFF_MIN
+        self._open_until = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def retry_in(self) -> float | None:
+        """Secondes restantes avant la prochaine requête de test."""
+        if self.state != STATE_OPEN:
+            return None
+        return max(0.0, self._open_until - time.monotonic())
+
+    @property
+    def attributes(self) -> dict[str, object]:
+        """État du disjoncteur exposé comme attributs d'entité."""
+        retry_in = self.retry_in
+        return {
+            "circuit_state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "backoff": self.backoff,
+            "retry_in": round(retry_in) if retry_in is not None else None,
+        }
+
+    def before_request(self) -> bool:
+        """Autorise ou refuse une requête ; retourne True pour une requête de test."""
+        if self.state == STATE_OPEN:
+            if time.monotonic() < self._open_until:
+                raise TwoNCircuitOpenError(
+                    f"{self._host} injoignable, circuit ouvert ({self.retry_in:.0f} s)"
+                )
+            self.state = STATE_HALF_OPEN
+
+        if self.state == STATE_HALF_OPEN:
+            if self._probe_in_flight:
+                raise TwoNCircuitOpenError(
+                    f"{self._host} injoignable, requête de test en cours"
+                )
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def end_probe(self) -> None:
+        """Libère la requête de test (quelle qu'en soit l'issue)."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Une réponse a été reçue : le circuit se referme."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("Connexion à %s rétablie", self._host)
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.backoff = BACKOFF_MIN
+
+    def record_failure(self) -> bool:
+        """Un échec de connexion a eu lieu ; retourne True si le circuit s'ouvre."""
+        self.consecutive_failures += 1
+        if self.state == STATE_HALF_OPEN:
+            self.backoff = min(self.backoff * 2, BACKOFF_MAX)
+        elif self.state == STATE_OPEN or self.consecutive_failures < FAILURE_THRESHOLD:
+            return False
+
+        opening = self.state == STATE_CLOSED
+        self.state = STATE_OPEN
+        self._open_until = time.monotonic() + self.backoff
+        if opening:
+            _LOGGER.error(
+                "%s injoignable après %s échecs, requêtes suspendues %s s",
+                self._host,
+                self.consecutive_failures,
+                self.backoff,
+            )
+        else:
+            _LOGGER.debug(
+                "%s toujours injoignable, prochain essai dans %s s",
+                self._host,
+                self.backoff,
+            )
+        return opening
@@ -12,6 +12,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import DOMAIN, TwoNAPI, TwoNDataUpdateCoordinator
+from .models import select_nothing
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,7 +46,7 @@ class TwoNAnswerButton(CoordinatorEntity, ButtonEntity):
         api: TwoNAPI,
     ) -> None:
         """Initialisation du bouton."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=select_nothing)
         self._api = api
         self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_answer"
         self._attr_name = "Answer Call"
@@ -81,7 +82,7 @@ class TwoNHangupButton(CoordinatorEntity, ButtonEntity):
         api: TwoNAPI,
     ) -> None:
         """Initialisation du bouton."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=select_nothing)
         self._api = api
         self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_hangup"
         self._attr_name = "Hangup Call"
@@ -117,7 +118,7 @@ class TwoNRestartButton(CoordinatorEntity, ButtonEntity):
         api: TwoNAPI,
     ) -> None:
         """Initialisation du bouton."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=select_nothing)
         self._api = api
         self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_restart"
         self._attr_name = "Restart Device"
@@ -138,11 +139,7 @@ class TwoNRestartButton(CoordinatorEntity, ButtonEntity):
     async def async_press(self) -> None:
         """Action lors de l'appui sur le bouton."""
         try:
-            url = f"{self._api.base_url}/system/restart"
-            async with self._api.session.post(
-                url, auth=self._api.auth
-            ) as response:
-                response.raise_for_status()
+            await self._api.restart_system()
             _LOGGER.info("Redémarrage de l'appareil demandé")
         except Exception as err:
             _LOGGER.error("Erreur lors du redémarrage: %s", err)
@@ -5,12 +5,16 @@ Fichier: custom_components/2n_intercom/camera.py
 
 import logging
 
-from homeassistant.components.camera import Camera
+from aiohttp import web
+
+from homeassistant.components.camera import Camera, CameraEntityFeature
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import DOMAIN, TwoNAPI, TwoNDataUpdateCoordinator
+from . import CONF_RTSP_STREAM, DOMAIN, TwoNAPI, TwoNDataUpdateCoordinator
+from .snapshot import SnapshotCache
+from .stream import MjpegBroadcaster
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,8 +29,24 @@ async def async_setup_entry(
         "coordinator"
     ]
     api: TwoNAPI = hass.data[DOMAIN][config_entry.entry_id]["api"]
+    snapshot_cache: SnapshotCache = hass.data[DOMAIN][config_entry.entry_id][
+        "snapshot_cache"
+    ]
+    mjpeg_stream: MjpegBroadcaster = hass.data[DOMAIN][config_entry.entry_id][
+        "mjpeg_stream"
+    ]
 
-    async_add_entities([TwoNCamera(coordinator, api)])
+    async_add_entities(
+        [
+            TwoNCamera(
+                coordinator,
+                api,
+                snapshot_cache,
+                mjpeg_stream,
+                config_entry.options.get(CONF_RTSP_STREAM, False),
+            )
+        ]
+    )
 
 
 class TwoNCamera(Camera):
@@ -36,11 +56,19 @@ class TwoNCamera(Camera):
         self,
         coordinator: TwoNDataUpdateCoordinator,
         api: TwoNAPI,
+        snapshot_cache: SnapshotCache,
+        mjpeg_stream: MjpegBroadcaster,
+        rtsp_stream: bool,
     ) -> None:
         """Initialisation de la caméra."""
         super().__init__()
         self._coordinator = coordinator
         self._api = api
+        self._snapshot_cache = snapshot_cache
+        self._mjpeg_stream = mjpeg_stream
+        self._rtsp_stream = rtsp_stream
+        if rtsp_stream:
+            self._attr_supported_features = CameraEntityFeature.STREAM
         system_info = coordinator.system_info.get("result", {})
         self._attr_unique_id = f"{system_info.get('serialNumber', 'unknown')}_{DOMAIN}_camera"
         self._attr_name = "Camera"
@@ -57,14 +85,30 @@ class TwoNCamera(Camera):
             "sw_version": system_info.get("swVersion", "Unknown"),
         }
 
+    @property
+    def extra_state_attributes(self):
+        """Retourne les compteurs du cache de snapshots et du flux MJPEG."""
+        return {**self._snapshot_cache.stats, "mjpeg_viewers": self._mjpeg_stream.viewers}
+
     async def async_camera_image(
         self, width: int | None = None, height: int | None = None
     ) -> bytes | None:
         """Retourne une image de la caméra."""
         try:
-            width = width or 640
-            height = height or 480
-            return await self._api.get_camera_snapshot(width, height)
+            # Sans taille demandée : image source du cache, sans redimensionnement
+            return await self._snapshot_cache.async_get_image(width, height)
         except Exception as err:
             _LOGGER.error("Erreur lors de la capture d'image: %s", err)
             return None
+
+    async def handle_async_mjpeg_stream(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
+        """Diffuse le flux MJPEG partagé de l'appareil."""
+        return await self._mjpeg_stream.async_serve(request)
+
+    async def stream_source(self) -> str | None:
+        """Retourne l'URL RTSP si le modèle dispose d'un serveur RTSP."""
+        if not self._rtsp_stream:
+            return None
+        return self._api.rtsp_url
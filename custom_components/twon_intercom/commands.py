@@ -0,0 +1,165 @@
+"""
+File de commandes d'écriture vers un appareil 2N.
+Fichier: custom_components/twon_intercom/commands.py
+
+Les écritures d'un appareil passent par des files : les commandes y sont
+envoyées une par une, dans l'ordre, au rythme d'un seau à jetons. Les
+commandes de switch et de sortie ont leur propre file, pour qu'une ouverture
+de porte n'attende jamais un envoi d'image ou une composition de numéro.
+Une mise à jour d'affichage encore en attente est remplacée par la suivante
+au lieu d'être envoyée deux fois.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Débit soutenu de commandes par appareil (commandes par seconde)
+COMMAND_RATE = 5.0
+
+# Nombre de commandes pouvant partir immédiatement après une période calme
+COMMAND_BURST = 5
+
+
+class _PendingCommand:
+    """Commande en attente dans la file."""
+
+    __slots__ = ("request", "coalesce_key", "cost", "future")
+
+    def __init__(
+        self,
+        request: Callable[[], Awaitable[Any]],
+        coalesce_key: str | None,
+        cost: int,
+        future: asyncio.Future,
+    ) -> None:
+        """Initialisation de la commande."""
+        self.request = request
+        self.coalesce_key = coalesce_key
+        self.cost = cost
+        self.future = future
+
+
+class TwoNCommandQueue:
+    """File d'écriture sérialisée et limitée en débit d'un appareil."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        host: str,
+        rate: float = COMMAND_RATE,
+        burst: int = COMMAND_BURST,
+        name: str = "commands",
+    ) -> None:
+        """Initialisation de la file."""
+        self._hass = hass
+        self._host = host
+        self._name = name
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._pending: deque[_PendingCommand] = deque()
+        self._task: asyncio.Task | None = None
+        self.sent = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        """Nombre de commandes en attente."""
+        return len(self._pending)
+
+    async def async_submit(
+        self,
+        request: Callable[[], Awaitable[Any]],
+        coalesce_key: str | None = None,
+        cost: int = 1,
+    ) -> Any:
+        """Ajoute une commande à la file et attend sa réponse.
+
+        Une commande portant la même coalesce_key qu'une commande encore en
+        attente la remplace : seule la plus récente est envoyée, et tous les
+        appelants reçoivent sa réponse. Un lot de plusieurs écritures compte
+        pour `cost` jetons.
+        """
+        if coalesce_key is not None:
+            for pending in self._pending:
+                if pending.coalesce_key == coalesce_key:
+                    pending.request = request
+                    self.coalesced += 1
+                    return await asyncio.shield(pending.future)
+
+        command = _PendingCommand(
+            request, coalesce_key, cost, self._hass.loop.create_future()
+        )
+        self._pending.append(command)
+        if self._task is None or self._task.done():
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"twon_intercom_{self._name}_{self._host}"
+            )
+        return await asyncio.shield(command.future)
+
+    async def async_stop(self) -> None:
+        """Arrête la file ; les commandes en attente sont annulées."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while self._pending:
+            self._pending.popleft().future.cancel()
+
+    async def _async_take_token(self, cost: int = 1) -> None:
+        """Attend que les jetons soient disponibles puis les consomme.
+
+        Un lot plus gros que la rafale part dès que le seau est plein ; le
+        dépassement est une dette payée par les commandes suivantes.
+        """
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._refilled) * self._rate
+        )
+        self._refilled = now
+        needed = min(cost, self._burst)
+        if self._tokens < needed:
+            delay = (needed - self._tokens) / self._rate
+            _LOGGER.debug(
+                "Débit de commandes atteint pour %s, attente de %.0f ms",
+                self._host,
+                delay * 1000,
+            )
+            await asyncio.sleep(delay)
+            self._tokens = float(needed)
+            self._refilled = time.monotonic()
+        self._tokens -= cost
+
+    async def _async_run(self) -> None:
+        """Envoie les commandes une par une, dans l'ordre d'arrivée."""
+        while self._pending:
+            await self._async_take_token(self._pending[0].cost)
+            # Retirée seulement maintenant : elle peut encore être remplacée
+            command = self._pending.popleft()
+            try:
+                result = await command.request()
+            except asyncio.CancelledError:
+                command.future.cancel()
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                if not command.future.done():
+                    command.future.set_exception(err)
+            else:
+                if not command.future.done():
+                    command.future.set_result(result)
+            self.sent += 1
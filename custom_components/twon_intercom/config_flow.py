@@ -3,19 +3,50 @@ Config flow pour l'intégration 2N Intercom.
 Fichier: custom_components/twon_intercom/config_flow.py
 """
 
+import asyncio
 import logging
 from typing import Any
 
 import aiohttp
 import voluptuous as vol
+from yarl import URL
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.components import ssdp
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_SSL,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.update_coordinator import UpdateFailed
 
-from . import DOMAIN, DEFAULT_PORT, TwoNAPI
+from . import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_AUTH_METHOD,
+    CONF_RTSP_STREAM,
+    CONF_SNAPSHOT_TTL,
+    DEFAULT_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SNAPSHOT_TTL,
+    DOMAIN,
+    TwoNAPI,
+    TwoNApiError,
+)
+from .auth import AUTH_BASIC, AUTH_DIGEST
+from .discovery import (
+    DiscoveredDevice,
+    InvalidNetwork,
+    async_probe_host,
+    async_scan_network,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,19 +56,53 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         vol.Required(CONF_USERNAME): str,
         vol.Required(CONF_PASSWORD): str,
         vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
+        vol.Optional(CONF_AUTH_METHOD, default=AUTH_BASIC): vol.In(
+            [AUTH_BASIC, AUTH_DIGEST]
+        ),
+        vol.Optional(CONF_SSL, default=False): bool,
+        vol.Optional(CONF_VERIFY_SSL, default=False): bool,
+    }
+)
+
+CONF_NETWORK = "network"
+CONF_DEVICES = "devices"
+
+# Contexte d'un flux d'import créé par l'ajout groupé : appareil déjà validé
+CONTEXT_VALIDATED = "validated"
+
+# Réponses HTTP signalant des identifiants refusés
+AUTH_HTTP_STATUSES = {401, 403}
+
+STEP_SCAN_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NETWORK): str,
+        vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
+        vol.Optional(CONF_SSL, default=False): bool,
+    }
+)
+
+STEP_CREDENTIALS_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_USERNAME): str,
+        vol.Required(CONF_PASSWORD): str,
+        vol.Optional(CONF_AUTH_METHOD, default=AUTH_BASIC): vol.In(
+            [AUTH_BASIC, AUTH_DIGEST]
+        ),
     }
 )
 
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Valide les informations de connexion."""
-    session = async_get_clientsession(hass)
+    session = async_get_clientsession(hass, verify_ssl=data.get(CONF_VERIFY_SSL, False))
     api = TwoNAPI(
         data[CONF_HOST],
         data[CONF_USERNAME],
         data[CONF_PASSWORD],
         data.get(CONF_PORT, DEFAULT_PORT),
         session,
+        data.get(CONF_AUTH_METHOD, AUTH_BASIC),
+        data.get(CONF_SSL, False),
     )
 
     try:
@@ -46,7 +111,22 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
             "title": f"2N {info.get('result', {}).get('variant', 'Intercom')}",
             "unique_id": info.get("result", {}).get("serialNumber", data[CONF_HOST]),
         }
-    except aiohttp.ClientError as err:
+    except TwoNApiError as err:
+        # Requête refusée par l'API : droits du compte insuffisants
+        _LOGGER.error("Accès refusé par %s: %s", data[CONF_HOST], err)
+        raise InvalidAuth from err
+    except UpdateFailed as err:
+        # TwoNAPI enveloppe les erreurs de transport dans UpdateFailed
+        cause = err.__cause__
+        if (
+            isinstance(cause, aiohttp.ClientResponseError)
+            and cause.status in AUTH_HTTP_STATUSES
+        ):
+            _LOGGER.error("Identifiants refusés par %s: %s", data[CONF_HOST], err)
+            raise InvalidAuth from err
+        _LOGGER.error("Erreur de connexion à %s: %s", data[CONF_HOST], err)
+        raise CannotConnect from err
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
         _LOGGER.error("Erreur de connexion: %s", err)
         raise CannotConnect from err
     except Exception as err:
@@ -59,10 +139,23 @@ class TwoNConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialisation du flux de configuration."""
+        self._discovered: dict[str, DiscoveredDevice] = {}
+        self._selected: list[DiscoveredDevice] = []
+        self._port = DEFAULT_PORT
+        self._ssl = False
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Gestion de l'étape initiale."""
+        """Gestion de l'étape initiale : saisie manuelle ou recherche réseau."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan"])
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Configuration d'un appareil dont l'adresse est saisie."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
@@ -81,12 +174,234 @@ class TwoNConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(title=info["title"], data=user_input)
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="manual", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Recherche des appareils 2N d'une plage réseau."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            self._port = user_input[CONF_PORT]
+            self._ssl = user_input[CONF_SSL]
+            try:
+                devices = await async_scan_network(
+                    async_get_clientsession(self.hass, verify_ssl=False),
+                    user_input[CONF_NETWORK],
+                    self._port,
+                    self._ssl,
+                )
+            except InvalidNetwork:
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                configured_ids = self._async_current_ids()
+                configured_hosts = {
+                    entry.data.get(CONF_HOST)
+                    for entry in self._async_current_entries()
+                }
+                self._discovered = {
+                    device.host: device
+                    for device in devices
+                    if device.host not in configured_hosts
+                    and (device.serial is None or device.serial not in configured_ids)
+                }
+                if self._discovered:
+                    return await self.async_step_select()
+                errors["base"] = "no_devices_found"
+
+        return self.async_show_form(
+            step_id="scan", data_schema=STEP_SCAN_DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_select(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Choix des appareils trouvés à ajouter."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            self._selected = [
+                self._discovered[host] for host in user_input[CONF_DEVICES]
+            ]
+            if self._selected:
+                return await self.async_step_credentials()
+            errors["base"] = "no_devices_selected"
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_DEVICES, default=list(self._discovered)): (
+                    cv.multi_select(
+                        {
+                            host: device.label
+                            for host, device in self._discovered.items()
+                        }
+                    )
+                ),
+            }
+        )
+        return self.async_show_form(step_id="select", data_schema=schema, errors=errors)
+
+    async def async_step_credentials(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Identifiants communs, validés en parallèle sur tous les appareils."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            candidates = [
+                {
+                    CONF_HOST: device.host,
+                    CONF_PORT: self._port,
+                    CONF_SSL: self._ssl,
+                    CONF_VERIFY_SSL: False,
+                    **user_input,
+                }
+                for device in self._selected
+            ]
+            results = await asyncio.gather(
+                *(validate_input(self.hass, data) for data in candidates),
+                return_exceptions=True,
+            )
+
+            configured_ids = self._async_current_ids()
+            valid: dict[str, tuple[dict[str, Any], dict[str, Any]]] = {}
+            failures: list[tuple[str, BaseException]] = []
+            for data, result in zip(candidates, results):
+                if isinstance(result, BaseException):
+                    failures.append((data[CONF_HOST], result))
+                elif result["unique_id"] not in configured_ids:
+                    valid.setdefault(result["unique_id"], (data, result))
+
+            if failures:
+                _LOGGER.warning(
+                    "Validation impossible pour %s appareil(s): %s",
+                    len(failures),
+                    ", ".join(f"{host} ({err!r})" for host, err in failures),
+                )
+            if valid:
+                return await self._async_create_entries(list(valid.values()))
+            if not failures:
+                return self.async_abort(reason="already_configured")
+            errors["base"] = (
+                "cannot_connect"
+                if all(isinstance(err, CannotConnect) for _, err in failures)
+                else "invalid_auth"
+            )
+
+        return self.async_show_form(
+            step_id="credentials",
+            data_schema=STEP_CREDENTIALS_DATA_SCHEMA,
+            errors=errors,
+            description_placeholders={
+                "devices": ", ".join(device.label for device in self._selected)
+            },
         )
 
+    async def _async_create_entries(
+        self, validated: list[tuple[dict[str, Any], dict[str, Any]]]
+    ) -> FlowResult:
+        """Crée une config entry par appareil validé.
+
+        Le flux courant crée la première ; les autres passent par un import
+        qui reprend le résultat de la validation, sans nouvelle requête.
+        """
+        for data, info in validated[1:]:
+            self.hass.async_create_task(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={
+                        "source": config_entries.SOURCE_IMPORT,
+                        CONTEXT_VALIDATED: info,
+                    },
+                    data=data,
+                )
+            )
+        data, info = validated[0]
+        await self.async_set_unique_id(info["unique_id"])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=info["title"], data=data)
+
+    async def async_step_ssdp(self, discovery_info: ssdp.SsdpServiceInfo) -> FlowResult:
+        """Appareil annoncé en SSDP sur le réseau local."""
+        host = URL(discovery_info.ssdp_location).host
+        if host is None:
+            return self.async_abort(reason="not_twon_device")
+        self._async_abort_entries_match({CONF_HOST: host})
+
+        device = await async_probe_host(
+            async_get_clientsession(self.hass, verify_ssl=False),
+            host,
+            self._port,
+            self._ssl,
+        )
+        if device is None:
+            return self.async_abort(reason="not_twon_device")
+        # Sans numéro de série (API protégée), l'hôte évite les flux en double
+        await self.async_set_unique_id(device.serial or host)
+        self._abort_if_unique_id_configured(updates={CONF_HOST: host})
+
+        self._selected = [device]
+        self.context["title_placeholders"] = {"name": device.label}
+        return await self.async_step_credentials()
+
     async def async_step_import(self, import_config: dict[str, Any]) -> FlowResult:
-        """Import de la configuration depuis configuration.yaml."""
-        return await self.async_step_user(import_config)
+        """Import de la configuration (configuration.yaml ou ajout groupé)."""
+        if (info := self.context.get(CONTEXT_VALIDATED)) is not None:
+            await self.async_set_unique_id(info["unique_id"])
+            self._abort_if_unique_id_configured()
+            return self.async_create_entry(title=info["title"], data=import_config)
+        return await self.async_step_manual(import_config)
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Retourne le flux d'options."""
+        return TwoNOptionsFlow(config_entry)
+
+
+class TwoNOptionsFlow(config_entries.OptionsFlow):
+    """Gestion des options de l'intégration 2N Intercom."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialisation du flux d'options."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Gestion des options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_SCAN_INTERVAL,
+                    default=options.get(
+                        CONF_SCAN_INTERVAL,
+                        self._entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ),
+                ): vol.All(int, vol.Range(min=5)),
+                vol.Optional(
+                    CONF_ADAPTIVE_POLLING,
+                    default=options.get(CONF_ADAPTIVE_POLLING, False),
+                ): bool,
+                vol.Optional(
+                    CONF_SNAPSHOT_TTL,
+                    default=options.get(CONF_SNAPSHOT_TTL, DEFAULT_SNAPSHOT_TTL),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+                vol.Optional(
+                    CONF_RTSP_STREAM,
+                    default=options.get(CONF_RTSP_STREAM, False),
+                ): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
 
 
 class CannotConnect(Exception):
@@ -0,0 +1,41 @@
+"""
+Diagnostics pour l'intégration 2N Intercom.
+Fichier: custom_components/twon_intercom/diagnostics.py
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import DOMAIN, TwoNDataUpdateCoordinator
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, "serialNumber", "macAddr"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Retourne les diagnostics d'une config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: TwoNDataUpdateCoordinator = entry_data["coordinator"]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "system_info": async_redact_data(coordinator.system_info, TO_REDACT),
+        "capabilities": coordinator.capabilities,
+        "capability_map": coordinator.capability_map,
+        "display": entry_data["display"].stats,
+        "change_detection": coordinator.change_detection,
+        "last_cycle_duration": coordinator.last_cycle_duration,
+        "command_latency": coordinator.command_latency.as_dict(),
+        "instrumentation": coordinator.api.instrumentation.as_dict(),
+        "event_stream": entry_data["event_stream"].stats,
+    }
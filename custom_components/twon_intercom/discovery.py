@@ -0,0 +1,134 @@
+"""
+Découverte réseau des appareils 2N.
+Fichier: custom_components/twon_intercom/discovery.py
+
+Une plage CIDR est sondée en parallèle (avec un plafond de connexions
+simultanées et des délais de connexion courts) sur l'endpoint system/info ;
+l'API HTTP 2N répond en JSON même sans identifiants, ce qui permet de
+reconnaître les appareils avant de demander les identifiants.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import logging
+from dataclasses import dataclass
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Nombre maximal de sondes simultanées
+DISCOVERY_PARALLELISM = 64
+
+# Délais d'une sonde (secondes) : connexion, puis réponse complète
+PROBE_CONNECT_TIMEOUT = 1.0
+PROBE_TIMEOUT = 3.0
+
+# Nombre maximal d'adresses d'une plage (un /22)
+MAX_SCAN_HOSTS = 1024
+
+# Domaine d'authentification de l'API HTTP 2N
+TWON_REALM = "HTTP API"
+
+
+class InvalidNetwork(ValueError):
+    """Plage réseau invalide ou trop large."""
+
+
+@dataclass(frozen=True, slots=True)
+class DiscoveredDevice:
+    """Appareil 2N trouvé sur le réseau.
+
+    Le numéro de série et le modèle ne sont connus que si system/info est
+    accessible sans identifiants.
+    """
+
+    host: str
+    serial: str | None = None
+    variant: str | None = None
+
+    @property
+    def label(self) -> str:
+        """Libellé affiché dans le flux de configuration."""
+        if self.variant:
+            return f"{self.host} (2N {self.variant})"
+        return self.host
+
+
+def scan_hosts(network: str) -> list[str]:
+    """Adresses à sonder d'une plage CIDR (ou d'une adresse seule)."""
+    try:
+        parsed = ipaddress.ip_network(network.strip(), strict=False)
+    except ValueError as err:
+        raise InvalidNetwork(str(err)) from err
+    if parsed.num_addresses > MAX_SCAN_HOSTS:
+        raise InvalidNetwork(
+            f"{network}: {parsed.num_addresses} adresses (max {MAX_SCAN_HOSTS})"
+        )
+    if parsed.num_addresses == 1:
+        return [str(parsed.network_address)]
+    return [str(host) for host in parsed.hosts()]
+
+
+async def async_probe_host(
+    session: aiohttp.ClientSession, host: str, port: int, use_ssl: bool
+) -> DiscoveredDevice | None:
+    """Vérifie (sans identifiants) qu'un hôte expose l'API HTTP 2N."""
+    scheme = "https" if use_ssl else "http"
+    url = f"{scheme}://{host}:{port}/api/system/info"
+    try:
+        async with session.get(
+            url,
+            timeout=aiohttp.ClientTimeout(
+                total=PROBE_TIMEOUT, sock_connect=PROBE_CONNECT_TIMEOUT
+            ),
+            allow_redirects=False,
+            ssl=False,
+        ) as response:
+            challenge = response.headers.get("WWW-Authenticate", "")
+            body = await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        return None
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and "success" in data:
+        result = data.get("result") or {}
+        return DiscoveredDevice(
+            host, result.get("serialNumber"), result.get("variant")
+        )
+    # API protégée : seul le domaine d'authentification identifie l'appareil
+    if response.status == 401 and TWON_REALM in challenge:
+        return DiscoveredDevice(host)
+    return None
+
+
+async def async_scan_network(
+    session: aiohttp.ClientSession,
+    network: str,
+    port: int,
+    use_ssl: bool,
+    parallelism: int = DISCOVERY_PARALLELISM,
+) -> list[DiscoveredDevice]:
+    """Sonde toutes les adresses d'une plage, au plus `parallelism` à la fois."""
+    hosts = scan_hosts(network)
+    semaphore = asyncio.Semaphore(parallelism)
+
+    async def _probe(host: str) -> DiscoveredDevice | None:
+        async with semaphore:
+            return await async_probe_host(session, host, port, use_ssl)
+
+    results = await asyncio.gather(*(_probe(host) for host in hosts))
+    devices = [device for device in results if device is not None]
+    _LOGGER.debug(
+        "%s: %s appareil(s) 2N sur %s adresse(s) sondée(s)",
+        network,
+        len(devices),
+        len(hosts),
+    )
+    return devices
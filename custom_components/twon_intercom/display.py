@@ -0,0 +1,203 @@
+"""
+Gestion du contenu affiché sur l'écran des appareils 2N.
+Fichier: custom_components/twon_intercom/display.py
+
+Les images sont converties une seule fois à la résolution native de l'écran
+(dans un executor) et conservées en cache, indexées par l'empreinte de leur
+contenu et leurs paramètres d'affichage. Un contenu déjà affiché sur
+l'appareil n'est pas renvoyé.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .snapshot import Image, resize_image
+
+if TYPE_CHECKING:
+    from . import TwoNDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Résolution utilisée lorsque l'appareil ne décrit pas son écran
+DEFAULT_DISPLAY_SIZE = (320, 240)
+
+# Nombre d'images pré-encodées conservées par appareil
+MAX_DISPLAY_ENTRIES = 8
+
+# Les mises à jour d'écran (texte ou image) en attente se remplacent
+DISPLAY_COALESCE_KEY = "display"
+
+DisplayKey = tuple[Any, ...]
+
+
+class DisplayContentCache:
+    """Cache des images pré-encodées et du contenu affiché d'un appareil."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TwoNDataUpdateCoordinator,
+        max_entries: int = MAX_DISPLAY_ENTRIES,
+    ) -> None:
+        """Initialisation du cache."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self.max_entries = max_entries
+        self._encoded: OrderedDict[DisplayKey, bytes] = OrderedDict()
+        self._size: tuple[int, int] | None = None
+        self._showing: DisplayKey | None = None
+        self._showing_uptime: int | None = None
+        self.uploads = 0
+        self.skipped = 0
+        self.bytes_saved = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Compteurs d'utilisation du cache."""
+        return {
+            "display_uploads": self.uploads,
+            "display_skipped": self.skipped,
+            "display_bytes_saved": self.bytes_saved,
+            "display_cache_entries": len(self._encoded),
+        }
+
+    def _uptime(self) -> int | None:
+        """Uptime de l'appareil connu du coordinateur."""
+        data = self._coordinator.data
+        if data is None or data.system_status is None:
+            return None
+        return data.system_status.up_time
+
+    def _is_showing(self, key: DisplayKey) -> bool:
+        """Retourne True si l'appareil affiche déjà ce contenu."""
+        if self._showing != key:
+            return False
+        uptime = self._uptime()
+        # Un uptime qui recule signale un redémarrage : l'écran a été effacé
+        return (
+            uptime is None
+            or self._showing_uptime is None
+            or uptime >= self._showing_uptime
+        )
+
+    def invalidate(self) -> None:
+        """Oublie le contenu affiché (le prochain envoi ne sera pas ignoré)."""
+        self._showing = None
+
+    async def _async_display_size(self) -> tuple[int, int]:
+        """Résolution native de l'écran, lue sur l'appareil jusqu'à réussite.
+
+        La résolution par défaut n'est retenue définitivement que si
+        l'appareil ne décrit pas son écran ; après une erreur passagère
+        (délai, coupe-circuit ouvert), display/caps est relu au prochain envoi.
+        """
+        # Import local : le paquet importe ce module à son chargement
+        from . import TwoNUnsupportedError
+
+        if self._size is not None:
+            return self._size
+        host = self._coordinator.api.host
+        try:
+            caps = await self._coordinator.api.get_display_caps()
+        except TwoNUnsupportedError:
+            self._size = DEFAULT_DISPLAY_SIZE
+            return self._size
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug(
+                "Lecture de display/caps de %s impossible (%s), %sx%s utilisé",
+                host,
+                err,
+                *DEFAULT_DISPLAY_SIZE,
+            )
+            return DEFAULT_DISPLAY_SIZE
+        try:
+            resolution = caps["result"]["displays"][0]["resolution"]
+            self._size = (int(resolution["width"]), int(resolution["height"]))
+        except (KeyError, IndexError, TypeError, ValueError) as err:
+            _LOGGER.debug(
+                "Résolution de l'écran de %s inconnue (%s), %sx%s utilisé",
+                host,
+                err,
+                *DEFAULT_DISPLAY_SIZE,
+            )
+            self._size = DEFAULT_DISPLAY_SIZE
+        return self._size
+
+    async def _async_encode(self, image: bytes) -> tuple[DisplayKey, bytes]:
+        """Retourne l'image convertie pour l'écran (depuis le cache si possible)."""
+        width, height = await self._async_display_size()
+        key = ("image", hashlib.sha256(image).hexdigest(), width, height)
+        if (encoded := self._encoded.get(key)) is not None:
+            self._encoded.move_to_end(key)
+            return key, encoded
+
+        if Image is None:
+            # Sans Pillow, l'image est envoyée telle quelle
+            encoded = image
+        else:
+            encoded = await self._hass.async_add_executor_job(
+                resize_image, image, width, height, "jpeg"
+            )
+        self._encoded[key] = encoded
+        while len(self._encoded) > self.max_entries:
+            self._encoded.popitem(last=False)
+        return key, encoded
+
+    async def async_show_image(self, image: bytes, force: bool = False) -> bool:
+        """Affiche une image ; retourne False si l'envoi était inutile."""
+        key, encoded = await self._async_encode(image)
+        return await self._async_show(
+            key,
+            lambda: self._coordinator.api.display_image(encoded),
+            len(encoded),
+            force,
+        )
+
+    async def async_show_text(
+        self, text: str, options: dict[str, Any], force: bool = False
+    ) -> bool:
+        """Affiche un texte ; retourne False si l'envoi était inutile."""
+        key = ("text", text, tuple(sorted(options.items())))
+        return await self._async_show(
+            key,
+            lambda: self._coordinator.api.display_text(text, **options),
+            0,
+            force,
+        )
+
+    async def _async_show(
+        self,
+        key: DisplayKey,
+        upload: Callable[[], Awaitable[dict]],
+        size: int,
+        force: bool,
+    ) -> bool:
+        """Envoie un contenu par la file de commandes s'il n'est pas déjà affiché."""
+        if not force and self._is_showing(key):
+            self.skipped += 1
+            self.bytes_saved += size
+            _LOGGER.debug(
+                "Contenu déjà affiché sur %s, envoi ignoré",
+                self._coordinator.api.host,
+            )
+            return False
+
+        async def _async_upload() -> None:
+            # Seul le contenu réellement envoyé (non remplacé) devient l'affichage
+            self.invalidate()
+            await upload()
+            self._showing = key
+            self._showing_uptime = self._uptime()
+            self.uploads += 1
+
+        await self._coordinator.command_queue.async_submit(
+            _async_upload, coalesce_key=DISPLAY_COALESCE_KEY
+        )
+        return True
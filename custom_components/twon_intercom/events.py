@@ -0,0 +1,214 @@
+"""
+Flux d'événements temps réel pour l'intégration 2N Intercom.
+Fichier: custom_components/twon_intercom/events.py
+
+Utilise le couple log/subscribe + log/pull de l'API HTTP 2N (long polling)
+pour recevoir les changements d'état sans attendre le prochain cycle de
+polling du coordinateur.
+
+Le dernier événement traité (curseur) est conservé entre deux démarrages :
+à la reprise, seuls les événements survenus pendant l'interruption sont
+redemandés à l'appareil, et ceux déjà traités sont ignorés.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+if TYPE_CHECKING:
+    from . import TwoNAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+# Événements du journal 2N qui modifient les données du coordinateur
+SUBSCRIBED_EVENTS = [
+    "CallStateChanged",
+    "InputChanged",
+    "OutputChanged",
+    "SwitchStateChanged",
+]
+
+# Durée de vie de l'abonnement côté appareil (renouvelée à chaque pull)
+SUBSCRIPTION_DURATION = 120
+
+# Durée maximale d'attente d'un log/pull
+PULL_TIMEOUT = 60
+
+# Délais de reconnexion après une erreur (secondes)
+RETRY_DELAY_MIN = 5
+RETRY_DELAY_MAX = 300
+
+# Marge ajoutée à la fenêtre de rattrapage (décalage d'horloge de l'appareil)
+CATCH_UP_MARGIN = 30
+
+# Fenêtre de rattrapage maximale après une longue interruption (secondes)
+MAX_CATCH_UP = 24 * 3600
+
+# Délai d'écriture groupée du curseur (secondes)
+CURSOR_SAVE_DELAY = 10
+
+
+class TwoNEventStream:
+    """Abonnement long polling au journal d'événements d'un appareil 2N."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: TwoNAPI,
+        on_events: Callable[[list[dict[str, Any]]], None],
+        on_connection_change: Callable[[bool], None],
+        store: Store[dict[str, Any]],
+        cursor: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialisation du flux d'événements."""
+        self._hass = hass
+        self._api = api
+        self._on_events = on_events
+        self._on_connection_change = on_connection_change
+        self._store = store
+        # Dernier événement traité : {"time": utcTime, "id": id}
+        self._cursor = cursor
+        self._task: asyncio.Task | None = None
+        self._subscription_id: int | None = None
+        self.connected = False
+        self.caught_up = 0
+        self.duplicates = 0
+        self.last_catch_up: int | None = None
+
+    @property
+    def started(self) -> bool:
+        """Retourne True si la boucle de réception a été démarrée."""
+        return self._task is not None
+
+    def async_start(self) -> None:
+        """Démarre la boucle de réception des événements."""
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"twon_intercom_events_{self._api.host}"
+            )
+
+    async def async_stop(self) -> None:
+        """Arrête la boucle et ferme l'abonnement sur l'appareil."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._subscription_id is not None:
+            try:
+                await self._api.log_unsubscribe(self._subscription_id)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Désabonnement impossible: %s", err)
+            self._subscription_id = None
+        # Arrêt volontaire : le coordinateur n'est pas notifié, pour ne pas
+        # relancer un polling de secours sur des sessions en cours de fermeture
+        self.connected = False
+        if self._cursor is not None:
+            await self._store.async_save(self._cursor)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Curseur et compteurs de rattrapage."""
+        return {
+            "cursor": self._cursor,
+            "last_catch_up": self.last_catch_up,
+            "caught_up": self.caught_up,
+            "duplicates": self.duplicates,
+        }
+
+    def _include(self) -> str:
+        """Point de départ de l'abonnement (paramètre include de log/subscribe).
+
+        Sans curseur, seuls les nouveaux événements sont demandés ; sinon, la
+        fenêtre couvre l'interruption (marge comprise), quelle que soit la
+        taille du journal de l'appareil.
+        """
+        if self._cursor is None:
+            self.last_catch_up = None
+            return "new"
+        gap = time.time() - self._cursor["time"] + CATCH_UP_MARGIN
+        self.last_catch_up = min(MAX_CATCH_UP, max(CATCH_UP_MARGIN, math.ceil(gap)))
+        return f"-{self.last_catch_up}"
+
+    def _new_events(self, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Écarte les événements déjà traités et avance le curseur."""
+        fresh = []
+        for event in events:
+            if "utcTime" not in event or "id" not in event:
+                fresh.append(event)
+                continue
+            # L'identifiant repart de zéro au redémarrage de l'appareil,
+            # l'horodatage départage donc en premier
+            key = (event["utcTime"], event["id"])
+            if self._cursor is not None and key <= (
+                self._cursor["time"],
+                self._cursor["id"],
+            ):
+                self.duplicates += 1
+                continue
+            self._cursor = {"time": key[0], "id": key[1]}
+            fresh.append(event)
+        return fresh
+
+    def _set_connected(self, connected: bool) -> None:
+        """Notifie le coordinateur d'un changement d'état du flux."""
+        if connected != self.connected:
+            self.connected = connected
+            self._on_connection_change(connected)
+
+    async def _async_run(self) -> None:
+        """Boucle principale : abonnement puis long polling, avec reconnexion."""
+        retry_delay = RETRY_DELAY_MIN
+        while True:
+            try:
+                include = self._include()
+                self._subscription_id = await self._api.log_subscribe(
+                    SUBSCRIBED_EVENTS, SUBSCRIPTION_DURATION, include
+                )
+                _LOGGER.debug(
+                    "Abonnement aux événements de %s ouvert (id %s, include %s)",
+                    self._api.host,
+                    self._subscription_id,
+                    include,
+                )
+                self._set_connected(True)
+                retry_delay = RETRY_DELAY_MIN
+                catching_up = include != "new"
+
+                while True:
+                    events = self._new_events(
+                        await self._api.log_pull(self._subscription_id, PULL_TIMEOUT)
+                    )
+                    if catching_up:
+                        # Le premier pull contient tout l'intervalle manqué
+                        self.caught_up += len(events)
+                        catching_up = False
+                    if events:
+                        self._on_events(events)
+                        self._store.async_delay_save(
+                            lambda: self._cursor, CURSOR_SAVE_DELAY
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug(
+                    "Flux d'événements de %s interrompu (%s), nouvel essai dans %s s",
+                    self._api.host,
+                    err,
+                    retry_delay,
+                )
+                self._subscription_id = None
+                self._set_connected(False)
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, RETRY_DELAY_MAX)
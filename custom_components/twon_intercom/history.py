@@ -0,0 +1,303 @@
+"""
+Historique des appels et des ouvertures d'un appareil 2N.
+Fichier: custom_components/twon_intercom/history.py
+
+Les sessions d'appel terminées et les activations de switch sont conservées
+dans un tampon circulaire en mémoire et ajoutées à un fichier JSON Lines
+local ; l'historique est interrogé sans passer par la base du recorder.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .transitions import (
+    EVENT_CALL_ANSWERED,
+    EVENT_CALL_ENDED,
+    EVENT_CALL_RINGING,
+    EVENT_SWITCH_CHANGED,
+    TIME_SOURCE_LOG,
+    Transition,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Nombre d'enregistrements conservés en mémoire par appareil
+HISTORY_SIZE = 500
+
+# Le fichier est réécrit (compacté) au-delà de ce nombre de lignes
+HISTORY_COMPACT_LINES = 4 * HISTORY_SIZE
+
+KIND_CALL = "call"
+KIND_ACCESS = "access"
+
+
+class CallRecord:
+    """Session d'appel terminée (datée de sa fin)."""
+
+    __slots__ = ("time", "started", "answered", "session", "direction", "device_time")
+
+    kind = KIND_CALL
+
+    def __init__(
+        self,
+        time: float,
+        started: float,
+        answered: float | None,
+        session: Any,
+        direction: str | None,
+        device_time: int | None,
+    ) -> None:
+        """Initialisation de l'enregistrement."""
+        self.time = time
+        self.started = started
+        self.answered = answered
+        self.session = session
+        self.direction = direction
+        self.device_time = device_time
+
+    def as_dict(self) -> dict[str, Any]:
+        """Représentation sérialisable."""
+        return {
+            "kind": self.kind,
+            "time": self.time,
+            "started": self.started,
+            "answered": self.answered,
+            "session": self.session,
+            "direction": self.direction,
+            "device_time": self.device_time,
+        }
+
+
+class AccessRecord:
+    """Activation d'un switch (ouverture de porte)."""
+
+    __slots__ = ("time", "switch", "device_time")
+
+    kind = KIND_ACCESS
+
+    def __init__(self, time: float, switch: int, device_time: int | None) -> None:
+        """Initialisation de l'enregistrement."""
+        self.time = time
+        self.switch = switch
+        self.device_time = device_time
+
+    def as_dict(self) -> dict[str, Any]:
+        """Représentation sérialisable."""
+        return {
+            "kind": self.kind,
+            "time": self.time,
+            "switch": self.switch,
+            "device_time": self.device_time,
+        }
+
+
+HistoryRecord = CallRecord | AccessRecord
+
+
+def _record_from_dict(data: dict[str, Any]) -> HistoryRecord | None:
+    """Reconstruit un enregistrement lu dans le fichier."""
+    try:
+        if data["kind"] == KIND_CALL:
+            return CallRecord(
+                data["time"],
+                data["started"],
+                data.get("answered"),
+                data.get("session"),
+                data.get("direction"),
+                data.get("device_time"),
+            )
+        if data["kind"] == KIND_ACCESS:
+            return AccessRecord(data["time"], data["switch"], data.get("device_time"))
+    except (KeyError, TypeError):
+        pass
+    return None
+
+
+class DeviceHistory:
+    """Tampon circulaire et journal append-only de l'historique d'un appareil."""
+
+    def __init__(
+        self, hass: HomeAssistant, path: str, size: int = HISTORY_SIZE
+    ) -> None:
+        """Initialisation de l'historique."""
+        self._hass = hass
+        self.path = path
+        self._records: deque[HistoryRecord] = deque(maxlen=size)
+        # Sessions en cours : (début, décroché) par identifiant de session
+        self._open_calls: dict[Any, tuple[float, float | None]] = {}
+        self._lines = 0
+        self._pending: list[str] = []
+        self._flushing = False
+
+    async def async_load(self) -> None:
+        """Charge les derniers enregistrements du fichier."""
+
+        def _read() -> list[str]:
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    return file.readlines()
+            except FileNotFoundError:
+                return []
+
+        lines = await self._hass.async_add_executor_job(_read)
+        self._lines = len(lines)
+        records = []
+        for line in lines[-self._records.maxlen :]:
+            try:
+                record = _record_from_dict(json.loads(line))
+            except ValueError:
+                continue
+            if record is not None:
+                records.append(record)
+        self._records.extend(sorted(records, key=lambda record: record.time))
+
+    @callback
+    def async_handle_transitions(
+        self, transitions: list[Transition], details: dict[str, Any]
+    ) -> None:
+        """Met à jour l'historique à partir des transitions de l'appareil.
+
+        Les transitions issues du journal sont datées par leur horodatage
+        appareil (utcTime), y compris les événements rattrapés après une
+        interruption ; les autres (confirmations de commande, polling) par
+        l'heure locale, l'heure appareil estimée restant dans device_time.
+        """
+        device_time = details.get("device_time")
+        if device_time is not None and details.get("time_source") == TIME_SOURCE_LOG:
+            now = device_time
+        else:
+            now = dt_util.utcnow().timestamp()
+        for event_type, data in transitions:
+            session = data.get("session")
+            if event_type == EVENT_CALL_RINGING:
+                self._open_calls.setdefault(session, (now, None))
+            elif event_type == EVENT_CALL_ANSWERED:
+                started, _ = self._open_calls.get(session, (now, None))
+                self._open_calls[session] = (started, now)
+            elif event_type == EVENT_CALL_ENDED:
+                started, answered = self._open_calls.pop(session, (now, None))
+                if answered is None and data.get("previous_state") == "connected":
+                    answered = started
+                self._append(
+                    CallRecord(
+                        now,
+                        started,
+                        answered,
+                        session,
+                        data.get("direction"),
+                        device_time,
+                    )
+                )
+            elif event_type == EVENT_SWITCH_CHANGED and data.get("active"):
+                self._append(AccessRecord(now, data["switch"], device_time))
+
+    def _append(self, record: HistoryRecord) -> None:
+        """Ajoute un enregistrement en mémoire et au fichier."""
+        # Le tampon reste trié par date (horloges appareil et locale mêlées)
+        position = len(self._records)
+        while position and self._records[position - 1].time > record.time:
+            position -= 1
+        if position == len(self._records):
+            self._records.append(record)
+        elif len(self._records) < self._records.maxlen:
+            self._records.insert(position, record)
+        elif position:
+            self._records.popleft()
+            self._records.insert(position - 1, record)
+        self._pending.append(json.dumps(record.as_dict()) + "\n")
+        if not self._flushing:
+            self._flushing = True
+            self._hass.async_create_background_task(
+                self._async_flush(), f"twon_intercom_history_{self.path}"
+            )
+
+    async def _async_flush(self) -> None:
+        """Écrit les lignes en attente (une seule écriture à la fois)."""
+        try:
+            while self._pending:
+                pending, self._pending = self._pending, []
+                lines = pending
+                compact = self._lines + len(lines) > HISTORY_COMPACT_LINES
+                if compact:
+                    # Réécriture avec le seul contenu du tampon
+                    lines = [
+                        json.dumps(record.as_dict()) + "\n"
+                        for record in self._records
+                    ]
+                try:
+                    await self._hass.async_add_executor_job(
+                        self._write, lines, compact
+                    )
+                except OSError as err:
+                    # Lignes remises en tête de l'attente (au plus la taille du
+                    # tampon), nouvel essai au prochain enregistrement
+                    retained = pending + self._pending
+                    self._pending = retained[-self._records.maxlen :]
+                    _LOGGER.warning(
+                        "Écriture de l'historique %s impossible (%s lignes en "
+                        "attente, %s abandonnées): %s",
+                        self.path,
+                        len(self._pending),
+                        len(retained) - len(self._pending),
+                        err,
+                    )
+                    break
+                self._lines = len(lines) if compact else self._lines + len(lines)
+        finally:
+            self._flushing = False
+
+    def _write(self, lines: list[str], compact: bool) -> None:
+        """Ajoute (ou réécrit) les lignes du fichier (dans un executor)."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if not compact:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.writelines(lines)
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.writelines(lines)
+        os.replace(temp_path, self.path)
+
+    def query(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        kind: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Enregistrements d'une période et d'un type, du plus récent au plus ancien."""
+        start_ts = start.timestamp() if start else None
+        end_ts = end.timestamp() if end else None
+        results: list[dict[str, Any]] = []
+        # Le tampon est trié par date : le parcours s'arrête au début de la période
+        for record in reversed(self._records):
+            if start_ts is not None and record.time < start_ts:
+                break
+            if end_ts is not None and record.time > end_ts:
+                continue
+            if kind is not None and record.kind != kind:
+                continue
+            results.append(record.as_dict())
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    async def async_remove(self) -> None:
+        """Supprime le fichier d'historique."""
+
+        def _remove() -> None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+        await self._hass.async_add_executor_job(_remove)
@@ -0,0 +1,150 @@
+"""
+Mesures de performance pour l'intégration 2N Intercom.
+Fichier: custom_components/twon_intercom/instrumentation.py
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+# Nombre d'échantillons conservés par fenêtre de latence
+LATENCY_SAMPLES = 256
+
+
+class LatencyWindow:
+    """Fenêtre glissante bornée de latences (en secondes)."""
+
+    __slots__ = ("_samples", "count", "last")
+
+    def __init__(self, size: int = LATENCY_SAMPLES) -> None:
+        """Initialisation de la fenêtre."""
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.last: float | None = None
+
+    def record(self, latency: float) -> None:
+        """Ajoute une mesure."""
+        self._samples.append(latency)
+        self.count += 1
+        self.last = latency
+
+    def percentile(self, percent: float) -> float | None:
+        """Retourne le percentile demandé (0-100) de la fenêtre."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+        return ordered[index]
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Résumé de la fenêtre en millisecondes."""
+
+        def _ms(value: float | None) -> float | None:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "count": self.count,
+            "last_ms": _ms(self.last),
+            "p50_ms": _ms(self.percentile(50)),
+            "p95_ms": _ms(self.percentile(95)),
+        }
+
+
+# Échantillons de latence conservés par endpoint
+ENDPOINT_LATENCY_SAMPLES = 128
+
+# Nombre de requêtes récentes sur lesquelles le taux d'erreur est calculé
+ERROR_RATE_WINDOW = 100
+
+# Endpoints en long polling : leur durée ne reflète pas la réactivité de l'appareil
+LONG_POLL_ENDPOINTS = frozenset({"log/pull"})
+
+
+class EndpointStats:
+    """Compteurs et latences d'un endpoint."""
+
+    __slots__ = ("requests", "errors", "timeouts", "bytes", "latency")
+
+    def __init__(self) -> None:
+        """Initialisation des compteurs."""
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.bytes = 0
+        self.latency = LatencyWindow(ENDPOINT_LATENCY_SAMPLES)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Résumé des compteurs."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes": self.bytes,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class DeviceInstrumentation:
+    """Mesures des requêtes d'un appareil, par endpoint et globalement."""
+
+    __slots__ = ("endpoints", "latency", "_outcomes")
+
+    def __init__(self) -> None:
+        """Initialisation des mesures."""
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.latency = LatencyWindow()
+        self._outcomes: deque[bool] = deque(maxlen=ERROR_RATE_WINDOW)
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        """Compteurs d'un endpoint (créés au premier appel)."""
+        if (stats := self.endpoints.get(endpoint)) is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def record(
+        self,
+        endpoint: str,
+        latency: float,
+        size: int = 0,
+        error: bool = False,
+        timeout: bool = False,
+    ) -> None:
+        """Enregistre une requête terminée (réponse reçue ou échec)."""
+        stats = self._stats(endpoint)
+        stats.requests += 1
+        stats.bytes += size
+        stats.errors += error or timeout
+        stats.timeouts += timeout
+        stats.latency.record(latency)
+        self._outcomes.append(error or timeout)
+        if endpoint not in LONG_POLL_ENDPOINTS:
+            self.latency.record(latency)
+
+    def record_error(self, endpoint: str) -> None:
+        """Requête aboutie mais refusée par l'API (success: false).
+
+        Appelé juste après record() pour la même requête, sans suspension
+        entre les deux : le dernier résultat enregistré est le sien.
+        """
+        self._stats(endpoint).errors += 1
+        if self._outcomes:
+            self._outcomes[-1] = True
+
+    @property
+    def error_rate(self) -> float | None:
+        """Part des requêtes récentes en erreur (en %)."""
+        if not self._outcomes:
+            return None
+        return round(100 * sum(self._outcomes) / len(self._outcomes), 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Résumé complet pour les diagnostics."""
+        return {
+            "latency": self.latency.as_dict(),
+            "error_rate": self.error_rate,
+            "endpoints": {
+                endpoint: stats.as_dict()
+                for endpoint, stats in sorted(self.endpoints.items())
+            },
+        }
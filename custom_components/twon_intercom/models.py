@@ -0,0 +1,270 @@
+"""
+Modèle d'état compact des appareils 2N.
+Fichier: custom_components/twon_intercom/models.py
+
+Les réponses JSON de l'API sont analysées une seule fois par cycle (ou par
+événement) en objets immuables à __slots__ ; les entités y lisent leur état
+par simple accès indexé.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+# États de session d'appel considérés comme un appel en cours
+ACTIVE_CALL_STATES = ("ringing", "connected")
+
+
+def _result(response: dict[str, Any]) -> dict[str, Any]:
+    """Contenu "result" d'une réponse de l'API."""
+    return response.get("result") or {}
+
+
+@dataclass(frozen=True, slots=True)
+class SystemStatus:
+    """Statut système (system/status)."""
+
+    system_time: int | None = None
+    up_time: int | None = None
+    temperature: float | None = None
+    # Instant (monotonic) de la lecture, ignoré par la détection de changements
+    fetched_at: float = field(default_factory=time.monotonic, compare=False)
+
+    def estimated_time(self, now: float | None = None) -> int | None:
+        """Heure appareil extrapolée depuis la lecture de system/status."""
+        if self.system_time is None:
+            return None
+        elapsed = (time.monotonic() if now is None else now) - self.fetched_at
+        return self.system_time + int(elapsed)
+
+    @classmethod
+    def from_response(cls, response: dict[str, Any]) -> SystemStatus:
+        """Analyse une réponse system/status."""
+        result = _result(response)
+        return cls(
+            system_time=result.get("systemTime"),
+            up_time=result.get("upTime"),
+            temperature=result.get("temperature"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SwitchState:
+    """États des switches (switch/status), indexés par numéro de switch."""
+
+    active: dict[int, bool] = field(default_factory=dict)
+
+    @classmethod
+    def from_response(cls, response: dict[str, Any]) -> SwitchState:
+        """Analyse une réponse switch/status."""
+        return cls(
+            {
+                switch.get("switch"): bool(switch.get("active"))
+                for switch in _result(response).get("switches", [])
+            }
+        )
+
+    def is_active(self, switch: int) -> bool:
+        """Retourne True si le switch est actif."""
+        return self.active.get(switch, False)
+
+    def with_switch(self, switch: int, active: bool) -> SwitchState | None:
+        """Copie avec l'état d'un switch modifié (None si switch inconnu)."""
+        if switch not in self.active:
+            return None
+        return replace(self, active={**self.active, switch: active})
+
+
+@dataclass(frozen=True, slots=True)
+class IoState:
+    """États des ports IO (io/status), indexés par port."""
+
+    active: dict[Any, bool] = field(default_factory=dict)
+
+    @classmethod
+    def from_response(cls, response: dict[str, Any]) -> IoState:
+        """Analyse une réponse io/status."""
+        return cls(
+            {
+                port.get("port"): port.get("state") == "active"
+                for port in _result(response).get("ports", [])
+            }
+        )
+
+    def is_active(self, port: Any) -> bool:
+        """Retourne True si le port est actif."""
+        return self.active.get(port, False)
+
+    def with_port(self, port: Any, active: bool) -> IoState | None:
+        """Copie avec l'état d'un port modifié (None si port inconnu)."""
+        if port not in self.active:
+            return None
+        return replace(self, active={**self.active, port: active})
+
+
+@dataclass(frozen=True, slots=True)
+class CallSession:
+    """Session d'appel."""
+
+    session: Any
+    state: str | None
+    direction: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CallState:
+    """Sessions d'appel (call/status), indexées par identifiant et par état."""
+
+    sessions: dict[Any, CallSession] = field(default_factory=dict)
+    by_state: dict[str | None, frozenset] = field(default_factory=dict)
+
+    @classmethod
+    def from_sessions(cls, sessions: list[CallSession]) -> CallState:
+        """Construit l'état et son index par état de session."""
+        by_state: dict[str | None, set] = {}
+        for session in sessions:
+            by_state.setdefault(session.state, set()).add(session.session)
+        return cls(
+            {session.session: session for session in sessions},
+            {state: frozenset(ids) for state, ids in by_state.items()},
+        )
+
+    @classmethod
+    def from_response(cls, response: dict[str, Any]) -> CallState:
+        """Analyse une réponse call/status."""
+        return cls.from_sessions(
+            [
+                CallSession(
+                    session.get("session"),
+                    session.get("state"),
+                    session.get("direction"),
+                )
+                for session in _result(response).get("sessions", [])
+            ]
+        )
+
+    def in_state(self, state: str) -> frozenset:
+        """Identifiants des sessions dans un état donné."""
+        return self.by_state.get(state, frozenset())
+
+    @property
+    def active(self) -> bool:
+        """Retourne True si une session sonne ou est établie."""
+        return any(self.by_state.get(state) for state in ACTIVE_CALL_STATES)
+
+    def with_event(
+        self, session_id: Any, state: str | None, direction: str | None
+    ) -> CallState:
+        """Copie mise à jour par un événement CallStateChanged."""
+        sessions = {
+            key: value for key, value in self.sessions.items() if key != session_id
+        }
+        if state != "terminated":
+            current = self.sessions.get(session_id)
+            sessions[session_id] = CallSession(
+                session_id,
+                state,
+                direction or (current.direction if current else None),
+            )
+        return self.from_sessions(list(sessions.values()))
+
+
+@dataclass(frozen=True, slots=True)
+class PhoneState:
+    """État du compte SIP principal (phone/status)."""
+
+    account_name: str | None = None
+    sip_uri: str | None = None
+    register_state: str | None = None
+    has_account: bool = False
+
+    @classmethod
+    def from_response(cls, response: dict[str, Any]) -> PhoneState:
+        """Analyse une réponse phone/status."""
+        accounts = _result(response).get("accounts", [])
+        if not accounts:
+            return cls()
+        account = accounts[0]
+        return cls(
+            account.get("accountName"),
+            account.get("sipUri"),
+            account.get("registerState"),
+            True,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TwoNData:
+    """Données du coordinateur ; None pour un endpoint indisponible."""
+
+    system_status: SystemStatus | None = None
+    switches: SwitchState | None = None
+    io: IoState | None = None
+    call: CallState | None = None
+    phone: PhoneState | None = None
+
+
+# Analyseur de la réponse de chaque endpoint interrogé par le coordinateur
+PARSERS = {
+    "system_status": SystemStatus.from_response,
+    "switches": SwitchState.from_response,
+    "io": IoState.from_response,
+    "call": CallState.from_response,
+    "phone": PhoneState.from_response,
+}
+
+
+# Sélecteurs de la détection de changements : une entité n'est notifiée que
+# si la valeur extraite par son sélecteur diffère entre deux instantanés
+Selector = Callable[[TwoNData], Any]
+
+
+def select_nothing(data: TwoNData) -> None:
+    """Entité sans état dépendant des données (boutons)."""
+    return None
+
+
+def select_system_time(data: TwoNData) -> int | None:
+    """Heure système de l'appareil."""
+    return data.system_status.system_time if data.system_status else None
+
+
+def select_temperature(data: TwoNData) -> float | None:
+    """Température de l'appareil (les variations d'uptime sont ignorées)."""
+    return data.system_status.temperature if data.system_status else None
+
+
+def select_call_active(data: TwoNData) -> bool | None:
+    """Présence d'un appel en cours."""
+    return data.call.active if data.call else None
+
+
+def select_ringing(data: TwoNData) -> frozenset:
+    """Sessions en cours de sonnerie."""
+    return data.call.in_state("ringing") if data.call else frozenset()
+
+
+def select_phone(data: TwoNData) -> PhoneState | None:
+    """État du compte SIP."""
+    return data.phone
+
+
+def select_io_port(port: Any) -> Selector:
+    """Sélecteur de l'état d'un port IO."""
+
+    def _select(data: TwoNData) -> bool | None:
+        return data.io.active.get(port) if data.io else None
+
+    return _select
+
+
+def select_switch(switch: int) -> Selector:
+    """Sélecteur de l'état d'un switch."""
+
+    def _select(data: TwoNData) -> bool | None:
+        return data.switches.active.get(switch) if data.switches else None
+
+    return _select
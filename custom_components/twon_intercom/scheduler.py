@@ -0,0 +1,114 @@
+"""
+Ordonnancement du polling à l'échelle de la flotte d'appareils 2N.
+Fichier: custom_components/twon_intercom/scheduler.py
+
+Toutes les config entries partagent un même ordonnanceur : chaque appareil
+reçoit un décalage de phase dans l'intervalle de polling, et le nombre de
+requêtes de polling simultanées est limité par appareil et pour la flotte.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+# Nombre maximal de requêtes de polling simultanées, tous appareils confondus
+FLEET_MAX_CONCURRENT_REQUESTS = 16
+
+# Fenêtre de calcul du pic de file d'attente de la flotte (secondes)
+PEAK_WINDOW = 60
+
+# Les phases successives (i * φ mod 1) restent uniformément réparties quel
+# que soit le nombre d'appareils enregistrés
+GOLDEN_RATIO_CONJUGATE = 0.6180339887498949
+
+
+class DeviceBudget:
+    """Limite et file d'attente des requêtes de polling d'un appareil."""
+
+    def __init__(self, limit: int, phase: float) -> None:
+        """Initialisation du budget de l'appareil."""
+        self.semaphore = asyncio.Semaphore(limit)
+        self.phase = phase
+        self.waiting = 0
+        self.in_flight = 0
+        self.peak_waiting = 0
+
+    def reset_peak(self) -> None:
+        """Réinitialise le pic de file d'attente (début de cycle)."""
+        self.peak_waiting = self.waiting
+
+
+class TwoNFleetScheduler:
+    """Répartition des phases et budget global de requêtes de la flotte."""
+
+    def __init__(self, limit: int = FLEET_MAX_CONCURRENT_REQUESTS) -> None:
+        """Initialisation de l'ordonnanceur."""
+        self._semaphore = asyncio.Semaphore(limit)
+        self._devices: dict[str, DeviceBudget] = {}
+        self._registrations = 0
+        self.in_flight = 0
+        self._peak_waiting = 0
+        self._peak_window_start = time.monotonic()
+
+    @property
+    def queue_depth(self) -> int:
+        """Nombre de requêtes de polling en attente sur toute la flotte."""
+        return sum(device.waiting for device in self._devices.values())
+
+    @property
+    def peak_queue_depth(self) -> int:
+        """Pic de requêtes en attente sur la fenêtre PEAK_WINDOW en cours."""
+        return self._peak_waiting
+
+    @property
+    def devices(self) -> int:
+        """Nombre d'appareils enregistrés."""
+        return len(self._devices)
+
+    def async_register(self, key: str, limit: int) -> DeviceBudget:
+        """Enregistre un appareil et lui attribue une phase."""
+        phase = (self._registrations * GOLDEN_RATIO_CONJUGATE) % 1
+        self._registrations += 1
+        device = self._devices[key] = DeviceBudget(limit, phase)
+        return device
+
+    def async_unregister(self, key: str) -> None:
+        """Retire un appareil de l'ordonnanceur."""
+        self._devices.pop(key, None)
+
+    def _record_waiting(self) -> None:
+        """Met à jour le pic de file d'attente de la flotte."""
+        now = time.monotonic()
+        if now - self._peak_window_start > PEAK_WINDOW:
+            self._peak_window_start = now
+            self._peak_waiting = 0
+        self._peak_waiting = max(self._peak_waiting, self.queue_depth)
+
+    @asynccontextmanager
+    async def slot(self, device: DeviceBudget) -> AsyncIterator[None]:
+        """Attend une place dans le budget de l'appareil puis de la flotte."""
+        device.waiting += 1
+        device.peak_waiting = max(device.peak_waiting, device.waiting)
+        self._record_waiting()
+        try:
+            await device.semaphore.acquire()
+            try:
+                await self._semaphore.acquire()
+            except BaseException:
+                device.semaphore.release()
+                raise
+        finally:
+            device.waiting -= 1
+
+        device.in_flight += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            device.in_flight -= 1
+            self.in_flight -= 1
+            self._semaphore.release()
+            device.semaphore.release()
@@ -7,11 +7,13 @@ import logging
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import DOMAIN, TwoNDataUpdateCoordinator
+from .models import select_phone, select_system_time, select_temperature
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,9 +31,13 @@ async def async_setup_entry(
     sensors = [
         TwoNUptimeSensor(coordinator),
         TwoNTemperatureSensor(coordinator),
+        TwoNQueueDepthSensor(coordinator),
+        TwoNPollCycleSensor(coordinator),
+        TwoNLatencySensor(coordinator),
+        TwoNErrorRateSensor(coordinator),
     ]
 
-    if coordinator.data.get("phone"):
+    if coordinator.has_endpoint("phone"):
         sensors.append(TwoNPhoneStateSensor(coordinator))
 
     async_add_entities(sensors)
@@ -45,7 +51,7 @@ class TwoNUptimeSensor(CoordinatorEntity, SensorEntity):
         coordinator: TwoNDataUpdateCoordinator,
     ) -> None:
         """Initialisation du sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=select_system_time)
         self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_uptime"
         self._attr_name = "Uptime"
         self._attr_icon = "mdi:clock-outline"
@@ -66,8 +72,8 @@ class TwoNUptimeSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self):
         """Retourne la valeur de l'uptime."""
-        system_status = self.coordinator.data.get("system_status", {})
-        return system_status.get("result", {}).get("systemTime")
+        system_status = self.coordinator.data.system_status
+        return system_status.system_time if system_status else None
 
 
 class TwoNTemperatureSensor(CoordinatorEntity, SensorEntity):
@@ -78,7 +84,7 @@ class TwoNTemperatureSensor(CoordinatorEntity, SensorEntity):
         coordinator: TwoNDataUpdateCoordinator,
     ) -> None:
         """Initialisation du sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=select_temperature)
         self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_temperature"
         self._attr_name = "Temperature"
         self._attr_icon = "mdi:thermometer"
@@ -100,8 +106,8 @@ class TwoNTemperatureSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self):
         """Retourne la température."""
-        system_status = self.coordinator.data.get("system_status", {})
-        return system_status.get("result", {}).get("temperature")
+        system_status = self.coordinator.data.system_status
+        return system_status.temperature if system_status else None
 
 
 class TwoNPhoneStateSensor(CoordinatorEntity, SensorEntity):
@@ -112,7 +118,7 @@ class TwoNPhoneStateSensor(CoordinatorEntity, SensorEntity):
         coordinator: TwoNDataUpdateCoordinator,
     ) -> None:
         """Initialisation du sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=select_phone)
         self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_phone_state"
         self._attr_name = "Phone State"
         self._attr_icon = "mdi:phone"
@@ -132,22 +138,188 @@ class TwoNPhoneStateSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self):
         """Retourne l'état du téléphone."""
-        phone_data = self.coordinator.data.get("phone", {})
-        accounts = phone_data.get("result", {}).get("accounts", [])
-        if accounts:
-            return accounts[0].get("registerState", "unknown")
+        phone = self.coordinator.data.phone
+        if phone is not None and phone.has_account:
+            return phone.register_state or "unknown"
         return "unknown"
 
     @property
     def extra_state_attributes(self):
         """Retourne les attributs supplémentaires."""
-        phone_data = self.coordinator.data.get("phone", {})
-        accounts = phone_data.get("result", {}).get("accounts", [])
-        if accounts:
-            account = accounts[0]
+        phone = self.coordinator.data.phone
+        if phone is not None and phone.has_account:
             return {
-                "account_name": account.get("accountName"),
-                "sip_uri": account.get("sipUri"),
-                "register_state": account.get("registerState"),
+                "account_name": phone.account_name,
+                "sip_uri": phone.sip_uri,
+                "register_state": phone.register_state,
             }
         return {}
+
+
+class TwoNQueueDepthSensor(CoordinatorEntity, SensorEntity):
+    """Représentation de la file d'attente des requêtes de polling."""
+
+    def __init__(
+        self,
+        coordinator: TwoNDataUpdateCoordinator,
+    ) -> None:
+        """Initialisation du sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_queue_depth"
+        self._attr_name = "Request Queue Depth"
+        self._attr_icon = "mdi:tray-full"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_state_class = "measurement"
+
+    @property
+    def device_info(self):
+        """Informations du device."""
+        system_info = self.coordinator.system_info.get("result", {})
+        return {
+            "identifiers": {(DOMAIN, system_info.get("serialNumber", "unknown"))},
+            "name": f"2N {system_info.get('variant', 'Intercom')}",
+            "manufacturer": "2N",
+            "model": system_info.get("variant", "Unknown"),
+            "sw_version": system_info.get("swVersion", "Unknown"),
+        }
+
+    @property
+    def native_value(self):
+        """Retourne le pic de requêtes en attente lors du dernier cycle."""
+        return self.coordinator.queue_depth
+
+    @property
+    def extra_state_attributes(self):
+        """Retourne les métriques de la flotte."""
+        scheduler = self.coordinator.scheduler
+        return {
+            "fleet_devices": scheduler.devices,
+            "fleet_queue_depth": scheduler.queue_depth,
+            "fleet_peak_queue_depth": scheduler.peak_queue_depth,
+            "fleet_in_flight": scheduler.in_flight,
+            "poll_phase": round(self.coordinator.budget.phase, 3),
+            **self.coordinator.change_detection,
+        }
+
+
+class TwoNPollCycleSensor(CoordinatorEntity, SensorEntity):
+    """Représentation de la durée du dernier cycle de polling."""
+
+    def __init__(
+        self,
+        coordinator: TwoNDataUpdateCoordinator,
+    ) -> None:
+        """Initialisation du sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_poll_cycle_duration"
+        self._attr_name = "Poll Cycle Duration"
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_native_unit_of_measurement = "ms"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+        self._attr_state_class = "measurement"
+
+    @property
+    def device_info(self):
+        """Informations du device."""
+        system_info = self.coordinator.system_info.get("result", {})
+        return {
+            "identifiers": {(DOMAIN, system_info.get("serialNumber", "unknown"))},
+            "name": f"2N {system_info.get('variant', 'Intercom')}",
+            "manufacturer": "2N",
+            "model": system_info.get("variant", "Unknown"),
+            "sw_version": system_info.get("swVersion", "Unknown"),
+        }
+
+    @property
+    def native_value(self):
+        """Retourne la durée du dernier cycle de polling."""
+        duration = self.coordinator.last_cycle_duration
+        return round(duration * 1000, 1) if duration is not None else None
+
+
+class TwoNLatencySensor(CoordinatorEntity, SensorEntity):
+    """Représentation de la latence p95 des requêtes vers l'appareil."""
+
+    def __init__(
+        self,
+        coordinator: TwoNDataUpdateCoordinator,
+    ) -> None:
+        """Initialisation du sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_latency_p95"
+        self._attr_name = "Request Latency p95"
+        self._attr_icon = "mdi:timer-sand"
+        self._attr_native_unit_of_measurement = "ms"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+        self._attr_state_class = "measurement"
+
+    @property
+    def device_info(self):
+        """Informations du device."""
+        system_info = self.coordinator.system_info.get("result", {})
+        return {
+            "identifiers": {(DOMAIN, system_info.get("serialNumber", "unknown"))},
+            "name": f"2N {system_info.get('variant', 'Intercom')}",
+            "manufacturer": "2N",
+            "model": system_info.get("variant", "Unknown"),
+            "sw_version": system_info.get("swVersion", "Unknown"),
+        }
+
+    @property
+    def native_value(self):
+        """Retourne le 95e percentile des latences récentes."""
+        return self.coordinator.api.instrumentation.latency.as_dict()["p95_ms"]
+
+    @property
+    def extra_state_attributes(self):
+        """Retourne les autres percentiles de latence."""
+        return self.coordinator.api.instrumentation.latency.as_dict()
+
+
+class TwoNErrorRateSensor(CoordinatorEntity, SensorEntity):
+    """Représentation du taux d'erreur des requêtes récentes."""
+
+    def __init__(
+        self,
+        coordinator: TwoNDataUpdateCoordinator,
+    ) -> None:
+        """Initialisation du sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_error_rate"
+        self._attr_name = "Request Error Rate"
+        self._attr_icon = "mdi:alert-circle-outline"
+        self._attr_native_unit_of_measurement = "%"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+        self._attr_state_class = "measurement"
+
+    @property
+    def device_info(self):
+        """Informations du device."""
+        system_info = self.coordinator.system_info.get("result", {})
+        return {
+            "identifiers": {(DOMAIN, system_info.get("serialNumber", "unknown"))},
+            "name": f"2N {system_info.get('variant', 'Intercom')}",
+            "manufacturer": "2N",
+            "model": system_info.get("variant", "Unknown"),
+            "sw_version": system_info.get("swVersion", "Unknown"),
+        }
+
+    @property
+    def native_value(self):
+        """Retourne la part des requêtes récentes en erreur."""
+        return self.coordinator.api.instrumentation.error_rate
+
+    @property
+    def extra_state_attributes(self):
+        """Retourne les compteurs par endpoint."""
+        return {
+            endpoint: {
+                "requests": stats.requests,
+                "errors": stats.errors,
+                "timeouts": stats.timeouts,
+            }
+            for endpoint, stats in self.coordinator.api.instrumentation.endpoints.items()
+        }
@@ -0,0 +1,359 @@
+"""
+Gestion des snapshots caméra pour l'intégration 2N Intercom.
+Fichier: custom_components/twon_intercom/snapshot.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow est fourni par Home Assistant
+    Image = None
+
+if TYPE_CHECKING:
+    from . import TwoNDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Nombre maximal de résolutions conservées en cache par appareil
+MAX_CACHED_SNAPSHOTS = 8
+
+# Résolution par défaut des snapshots
+DEFAULT_SNAPSHOT_SIZE = (640, 480)
+
+# Rafale déclenchée à la sonnerie : nombre d'images et intervalle entre elles
+BURST_FRAMES = 5
+BURST_INTERVAL = 0.5
+
+# Nombre d'images conservées dans le tampon circulaire
+BURST_BUFFER_SIZE = 15
+
+# Durée pendant laquelle les images de la rafale sont servies à la caméra
+BURST_SERVE_WINDOW = 10
+
+# Qualité d'encodage des images dérivées
+JPEG_QUALITY = 80
+WEBP_QUALITY = 75
+
+# Signatures des réponses de camera/snapshot acceptées (JPEG, PNG)
+IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG")
+
+SnapshotKey = tuple[int, int, str]
+# Image source, à la plus grande résolution annoncée par camera/caps ; les
+# autres tailles en sont dérivées localement
+SOURCE_KEY: SnapshotKey = (0, 0, "source")
+
+
+def largest_snapshot_size(caps: dict[str, Any]) -> tuple[int, int]:
+    """Plus grande résolution JPEG annoncée par camera/caps."""
+    sizes = [
+        (resolution["width"], resolution["height"])
+        for resolution in (caps.get("result") or {}).get("jpegResolution", [])
+        if isinstance(resolution.get("width"), int)
+        and isinstance(resolution.get("height"), int)
+    ]
+    if not sizes:
+        return DEFAULT_SNAPSHOT_SIZE
+    return max(sizes, key=lambda size: size[0] * size[1])
+
+
+def check_image(body: bytes) -> bytes:
+    """Rejette une réponse qui n'est pas une image (erreur JSON de l'appareil)."""
+    if not body.startswith(IMAGE_SIGNATURES):
+        raise HomeAssistantError(
+            f"Réponse de camera/snapshot invalide: {body[:120]!r}"
+        )
+    return body
+
+
+def resize_image(image: bytes, width: int, height: int, fmt: str) -> bytes:
+    """Redimensionne et ré-encode une image (à exécuter dans un executor)."""
+    with Image.open(io.BytesIO(image)) as source:
+        # draft() laisse le décodeur JPEG réduire l'image à moindre coût
+        source.draft("RGB", (width, height))
+        resized = source.convert("RGB")
+        resized.thumbnail((width, height), Image.Resampling.BILINEAR)
+        output = io.BytesIO()
+        if fmt == "webp":
+            resized.save(output, "WEBP", quality=WEBP_QUALITY, method=4)
+        else:
+            resized.save(output, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        return output.getvalue()
+
+
+class SnapshotCache:
+    """Cache TTL des snapshots, indexé par (largeur, hauteur, format).
+
+    Une seule image pleine résolution est demandée à l'appareil ; les tailles
+    inférieures en sont dérivées dans un executor et mises en cache avec elle.
+    Les appels simultanés pour une même clé partagent une seule requête ; les
+    entrées les moins récemment utilisées sont évincées au-delà de
+    MAX_CACHED_SNAPSHOTS.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        fetch: Callable[[int, int], Awaitable[bytes]],
+        ttl: float,
+        caps: Callable[[], Awaitable[dict[str, Any]]] | None = None,
+        max_entries: int = MAX_CACHED_SNAPSHOTS,
+    ) -> None:
+        """Initialisation du cache."""
+        self._hass = hass
+        self._fetch = fetch
+        self._caps = caps
+        self._caps_lock = asyncio.Lock()
+        # Résolution de l'image source, lue une fois dans camera/caps
+        self.source_size: tuple[int, int] | None = None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[SnapshotKey, tuple[float, bytes]] = OrderedDict()
+        self._inflight: dict[SnapshotKey, asyncio.Task[bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Compteurs d'utilisation du cache."""
+        return {
+            "snapshot_cache_hits": self.hits,
+            "snapshot_cache_misses": self.misses,
+            "snapshot_cache_coalesced": self.coalesced,
+            "snapshot_cache_entries": len(self._entries),
+        }
+
+    def _get_entry(self, key: SnapshotKey) -> tuple[float, bytes] | None:
+        """Retourne l'entrée (expiration, image) si elle est encore valide."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: SnapshotKey, image: bytes, expires: float) -> None:
+        """Ajoute une image au cache en respectant la taille maximale."""
+        self._entries[key] = (expires, image)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def store_source(self, image: bytes, ttl: float | None = None) -> None:
+        """Remplace l'image source ; les tailles dérivées sont invalidées."""
+        for key in [key for key in self._entries if key != SOURCE_KEY]:
+            del self._entries[key]
+        self._store(SOURCE_KEY, image, time.monotonic() + (ttl or self.ttl))
+
+    async def async_get_image(
+        self, width: int | None = None, height: int | None = None, fmt: str = "jpeg"
+    ) -> bytes:
+        """Retourne une image à la taille demandée, dérivée de l'image source.
+
+        Une dimension absente est celle de l'image source : sans taille
+        demandée, l'image source est servie telle quelle.
+        """
+        source_width, source_height = await self._async_source_size()
+        width = width or source_width
+        height = height or source_height
+        if Image is None:
+            # Sans Pillow, chaque taille est demandée directement à l'appareil
+            key = (width, height, fmt)
+            return await self._async_get(
+                key, lambda: self._async_fetch_direct(key)
+            )
+
+        if width >= source_width and height >= source_height:
+            if fmt == "jpeg":
+                return await self._async_get(SOURCE_KEY, self._async_fetch_source)
+            width, height = source_width, source_height
+        key = (width, height, fmt)
+        return await self._async_get(key, lambda: self._async_derive(key))
+
+    async def _async_source_size(self) -> tuple[int, int]:
+        """Résolution de l'image source (camera/caps, lu une seule fois)."""
+        if self.source_size is not None:
+            return self.source_size
+        if self._caps is None:
+            return DEFAULT_SNAPSHOT_SIZE
+        async with self._caps_lock:
+            if self.source_size is None:
+                try:
+                    caps = await self._caps()
+                except Exception as err:  # pylint: disable=broad-except
+                    # Nouvel essai à la prochaine image
+                    _LOGGER.debug("Lecture de camera/caps impossible: %s", err)
+                    return DEFAULT_SNAPSHOT_SIZE
+                self.source_size = largest_snapshot_size(caps)
+        return self.source_size
+
+    async def async_capture_source(self) -> bytes:
+        """Force la capture d'une nouvelle image source (requête partagée)."""
+        if SOURCE_KEY not in self._inflight:
+            self.misses += 1
+        return await self._async_shared(SOURCE_KEY, self._async_fetch_source)
+
+    async def _async_get(
+        self, key: SnapshotKey, produce: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Retourne une entrée depuis le cache ou via une production partagée.
+
+        Seule la demande initiale est comptée dans les statistiques.
+        """
+        if (entry := self._get_entry(key)) is not None:
+            self.hits += 1
+            return entry[1]
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        return await self._async_shared(key, produce)
+
+    async def _async_shared(
+        self, key: SnapshotKey, produce: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Attend la production en cours d'une entrée, ou la lance."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start(key, produce)
+        # shield : l'annulation d'un appelant n'interrompt pas les autres
+        return await asyncio.shield(task)
+
+    def _start(
+        self, key: SnapshotKey, produce: Callable[[], Awaitable[bytes]]
+    ) -> asyncio.Task[bytes]:
+        """Lance la production unique d'une entrée."""
+
+        async def _run() -> bytes:
+            try:
+                return await produce()
+            finally:
+                self._inflight.pop(key, None)
+
+        task = self._inflight[key] = asyncio.ensure_future(_run())
+        return task
+
+    async def _async_fetch_source(self) -> bytes:
+        """Récupère l'image pleine résolution sur l'appareil."""
+        image = check_image(await self._fetch(*await self._async_source_size()))
+        self.store_source(image)
+        return image
+
+    async def _async_fetch_direct(self, key: SnapshotKey) -> bytes:
+        """Récupère une taille précise sur l'appareil (sans redimensionnement)."""
+        image = check_image(await self._fetch(key[0], key[1]))
+        self._store(key, image, time.monotonic() + self.ttl)
+        return image
+
+    async def _async_derive(self, key: SnapshotKey) -> bytes:
+        """Dérive une taille inférieure de l'image source."""
+        if (entry := self._get_entry(SOURCE_KEY)) is not None:
+            expires, source = entry
+        else:
+            # Requête interne : déjà comptée avec la demande de la taille dérivée
+            source = await self._async_shared(SOURCE_KEY, self._async_fetch_source)
+            expires = self._entries.get(SOURCE_KEY, (0.0, None))[0]
+        image = await self._hass.async_add_executor_job(resize_image, source, *key)
+        # Une image dérivée n'est jamais conservée plus longtemps que sa source
+        current = self._entries.get(SOURCE_KEY)
+        if current is not None and current[1] is source and expires > time.monotonic():
+            self._store(key, image, expires)
+        return image
+
+
+class PreCaptureBuffer:
+    """Tampon circulaire d'images capturées en rafale au début d'une sonnerie."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TwoNDataUpdateCoordinator,
+        snapshot_cache: SnapshotCache,
+        size: int = BURST_BUFFER_SIZE,
+    ) -> None:
+        """Initialisation du tampon."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._snapshot_cache = snapshot_cache
+        self._frames: deque[tuple[datetime, float, bytes]] = deque(maxlen=size)
+        self._ringing: frozenset = frozenset()
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_handle_coordinator_update(self) -> None:
+        """Déclenche une rafale lorsqu'une nouvelle session passe en sonnerie."""
+        data = self._coordinator.data
+        ringing = (
+            data.call.in_state("ringing")
+            if data is not None and data.call is not None
+            else frozenset()
+        )
+        if ringing - self._ringing and (self._task is None or self._task.done()):
+            self._task = self._hass.async_create_background_task(
+                self._async_capture_burst(),
+                f"twon_intercom_precapture_{self._coordinator.api.host}",
+            )
+        self._ringing = ringing
+
+    async def async_stop(self) -> None:
+        """Annule la rafale en cours."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _async_capture_burst(self) -> None:
+        """Capture une rafale d'images dans le tampon."""
+        for index in range(BURST_FRAMES):
+            if index:
+                await asyncio.sleep(BURST_INTERVAL)
+            try:
+                image = await self._snapshot_cache.async_capture_source()
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Pré-capture interrompue: %s", err)
+                return
+            self._frames.append((dt_util.utcnow(), time.monotonic(), image))
+            # La caméra sert la dernière image de la rafale sans requête
+            self._snapshot_cache.store_source(image, BURST_SERVE_WINDOW)
+
+    async def async_save(
+        self, directory: str, prefix: str, best_only: bool = False
+    ) -> list[str]:
+        """Enregistre les images du tampon (ou la meilleure seulement) sur disque."""
+        frames = list(self._frames)
+        if best_only and frames:
+            frames = [max(frames, key=lambda frame: len(frame[2]))]
+
+        def _write() -> list[str]:
+            os.makedirs(directory, exist_ok=True)
+            paths = []
+            for captured, _, image in frames:
+                path = os.path.join(
+                    directory, f"{prefix}_{captured:%Y%m%d_%H%M%S_%f}.jpg"
+                )
+                with open(path, "wb") as file:
+                    file.write(image)
+                paths.append(path)
+            return paths
+
+        return await self._hass.async_add_executor_job(_write)
@@ -0,0 +1,141 @@
+"""
+Diffusion MJPEG partagée pour l'intégration 2N Intercom.
+Fichier: custom_components/twon_intercom/stream.py
+
+Une seule connexion MJPEG est ouverte vers l'appareil, quel que soit le
+nombre de spectateurs ; chaque image reçue est redistribuée à tous les
+abonnés et la connexion est fermée au départ du dernier.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+from homeassistant.core import HomeAssistant
+
+if TYPE_CHECKING:
+    from . import TwoNAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+MJPEG_WIDTH = 640
+MJPEG_HEIGHT = 480
+MJPEG_FPS = 10
+
+# Nombre d'images en attente par spectateur (les plus anciennes sont abandonnées)
+SUBSCRIBER_QUEUE_SIZE = 2
+
+# Taille maximale d'une image avant de considérer le flux comme corrompu
+MAX_FRAME_SIZE = 2 * 1024 * 1024
+
+BOUNDARY = "twonframe"
+JPEG_START = b"\xff\xd8"
+JPEG_END = b"\xff\xd9"
+
+
+class MjpegBroadcaster:
+    """Connexion MJPEG unique redistribuée à plusieurs spectateurs."""
+
+    def __init__(self, hass: HomeAssistant, api: TwoNAPI) -> None:
+        """Initialisation du diffuseur."""
+        self._hass = hass
+        self._api = api
+        self._subscribers: set[asyncio.Queue[bytes | None]] = set()
+        self._task: asyncio.Task | None = None
+        self.latest_frame: bytes | None = None
+
+    @property
+    def viewers(self) -> int:
+        """Nombre de spectateurs connectés."""
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue[bytes | None]:
+        """Ajoute un spectateur et ouvre la connexion amont si nécessaire."""
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run_upstream(), f"twon_intercom_mjpeg_{self._api.host}"
+            )
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[bytes | None]) -> None:
+        """Retire un spectateur et ferme la connexion amont s'il était le dernier."""
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def async_stop(self) -> None:
+        """Ferme la connexion amont et déconnecte tous les spectateurs."""
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._broadcast(None)
+        self._subscribers.clear()
+
+    def _broadcast(self, frame: bytes | None) -> None:
+        """Envoie une image à tous les spectateurs sans jamais bloquer."""
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frame)
+
+    async def _async_run_upstream(self) -> None:
+        """Lit le flux de l'appareil et découpe les images JPEG."""
+        buffer = bytearray()
+        try:
+            async with self._api.open_mjpeg_stream(
+                MJPEG_WIDTH, MJPEG_HEIGHT, MJPEG_FPS
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    buffer.extend(chunk)
+                    while (start := buffer.find(JPEG_START)) != -1 and (
+                        end := buffer.find(JPEG_END, start + 2)
+                    ) != -1:
+                        frame = bytes(buffer[start : end + 2])
+                        del buffer[: end + 2]
+                        self.latest_frame = frame
+                        self._broadcast(frame)
+                    if len(buffer) > MAX_FRAME_SIZE:
+                        _LOGGER.debug("Image MJPEG trop volumineuse, tampon vidé")
+                        buffer.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Flux MJPEG de %s interrompu: %s", self._api.host, err)
+        # Fin du flux amont : les spectateurs sont déconnectés
+        self._task = None
+        self._broadcast(None)
+        self._subscribers.clear()
+
+    async def async_serve(self, request: web.Request) -> web.StreamResponse:
+        """Envoie le flux partagé à un client HTTP."""
+        response = web.StreamResponse()
+        response.content_type = f"multipart/x-mixed-replace;boundary={BOUNDARY}"
+        await response.prepare(request)
+
+        queue = self.subscribe()
+        try:
+            while (frame := await queue.get()) is not None:
+                await response.write(
+                    f"--{BOUNDARY}\r\n"
+                    "Content-Type: image/jpeg\r\n"
+                    f"Content-Length: {len(frame)}\r\n\r\n".encode()
+                    + frame
+                    + b"\r\n"
+                )
+        except ConnectionResetError:
+            pass
+        finally:
+            self.unsubscribe(queue)
+        return response
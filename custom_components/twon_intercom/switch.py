@@ -1,97 +1,166 @@
 """
-Config flow pour l'intégration 2N Intercom.
-Fichier: custom_components/twon_intercom/config_flow.py
+Plateforme Switch pour l'intégration 2N Intercom.
+Fichier: custom_components/twon_intercom/switch.py
 """
 
 import logging
 from typing import Any
 
-import aiohttp
-import voluptuous as vol
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
-from homeassistant.core import HomeAssistant
-from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from . import DOMAIN, DEFAULT_PORT, TwoNAPI
+from . import COMMAND_LATENCY_TARGET, DOMAIN, TwoNDataUpdateCoordinator
+from .models import Selector, select_io_port, select_switch
 
 _LOGGER = logging.getLogger(__name__)
 
-STEP_USER_DATA_SCHEMA = vol.Schema(
-    {
-        vol.Required(CONF_HOST): str,
-        vol.Required(CONF_USERNAME): str,
-        vol.Required(CONF_PASSWORD): str,
-        vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
-    }
-)
-
-
-async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
-    """Valide les informations de connexion."""
-    session = async_get_clientsession(hass)
-    api = TwoNAPI(
-        data[CONF_HOST],
-        data[CONF_USERNAME],
-        data[CONF_PASSWORD],
-        data.get(CONF_PORT, DEFAULT_PORT),
-        session,
-    )
-
-    try:
-        info = await api.get_system_info()
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Configuration des switches depuis une config entry."""
+    coordinator: TwoNDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][
+        "coordinator"
+    ]
+
+    switches = []
+
+    # Ajout des switches matériels (relais de porte, gâche...)
+    if coordinator.has_endpoint("switches"):
+        switch_caps = coordinator.capabilities.get("switches", {})
+        for switch in switch_caps.get("result", {}).get("switches", []):
+            if switch.get("enabled", True):
+                switches.append(TwoNSwitch(coordinator, switch.get("switch")))
+
+    # Ajout des sorties IO
+    if coordinator.has_endpoint("io"):
+        io_caps = coordinator.capabilities.get("io", {})
+        for port in io_caps.get("result", {}).get("ports", []):
+            if port.get("type") == "output":
+                switches.append(TwoNOutputSwitch(coordinator, port.get("port")))
+
+    async_add_entities(switches)
+
+
+class TwoNCommandSwitch(CoordinatorEntity, SwitchEntity):
+    """Base des switches commandés par la voie prioritaire.
+
+    Le nouvel état est affiché immédiatement (optimiste), puis confirmé par
+    la relecture du seul statut concerné. L'état remonté par l'appareil est
+    lu par le sélecteur, aussi utilisé pour la détection de changements.
+    """
+
+    _target = ""
+
+    def __init__(
+        self,
+        coordinator: TwoNDataUpdateCoordinator,
+        index: int | str,
+        selector: Selector,
+    ) -> None:
+        """Initialisation du switch."""
+        super().__init__(coordinator, context=selector)
+        self._index = index
+        self._selector = selector
+        self._optimistic: bool | None = None
+
+    @property
+    def device_info(self):
+        """Informations du device."""
+        system_info = self.coordinator.system_info.get("result", {})
+        return {
+            "identifiers": {(DOMAIN, system_info.get("serialNumber", "unknown"))},
+            "name": f"2N {system_info.get('variant', 'Intercom')}",
+            "manufacturer": "2N",
+            "model": system_info.get("variant", "Unknown"),
+            "sw_version": system_info.get("swVersion", "Unknown"),
+        }
+
+    @property
+    def is_on(self) -> bool:
+        """Retourne l'état optimiste pendant une commande, sinon l'état confirmé."""
+        if self._optimistic is not None:
+            return self._optimistic
+        data = self.coordinator.data
+        return data is not None and bool(self._selector(data))
+
+    @property
+    def extra_state_attributes(self):
+        """Retourne les latences appui → confirmation des commandes."""
         return {
-            "title": f"2N {info.get('result', {}).get('variant', 'Intercom')}",
-            "unique_id": info.get("result", {}).get("serialNumber", data[CONF_HOST]),
+            "command_latency": self.coordinator.command_latency.as_dict(),
+            "command_latency_target_ms": COMMAND_LATENCY_TARGET * 1000,
         }
-    except aiohttp.ClientError as err:
-        _LOGGER.error("Erreur de connexion: %s", err)
-        raise CannotConnect from err
-    except Exception as err:
-        _LOGGER.exception("Erreur inattendue: %s", err)
-        raise InvalidAuth from err
-
-
-class TwoNConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
-    """Gestion du flux de configuration pour 2N Intercom."""
-
-    VERSION = 1
-
-    async def async_step_user(
-        self, user_input: dict[str, Any] | None = None
-    ) -> FlowResult:
-        """Gestion de l'étape initiale."""
-        errors: dict[str, str] = {}
-
-        if user_input is not None:
-            try:
-                info = await validate_input(self.hass, user_input)
-            except CannotConnect:
-                errors["base"] = "cannot_connect"
-            except InvalidAuth:
-                errors["base"] = "invalid_auth"
-            except Exception:  # pylint: disable=broad-except
-                _LOGGER.exception("Erreur inattendue")
-                errors["base"] = "unknown"
-            else:
-                await self.async_set_unique_id(info["unique_id"])
-                self._abort_if_unique_id_configured()
-                return self.async_create_entry(title=info["title"], data=user_input)
-
-        return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
-        )
-
-    async def async_step_import(self, import_config: dict[str, Any]) -> FlowResult:
-        """Import de la configuration depuis configuration.yaml."""
-        return await self.async_step_user(import_config)
-
-
-class CannotConnect(Exception):
-    """Erreur de connexion."""
-
-
-class InvalidAuth(Exception):
-    """Erreur d'authentification."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Les données confirmées remplacent l'état optimiste."""
+        self._optimistic = None
+        super()._handle_coordinator_update()
+
+    async def _async_command(self, action: str, state: bool) -> None:
+        """Applique l'état de façon optimiste puis exécute la commande."""
+        self._optimistic = state
+        self.async_write_ha_state()
+        try:
+            await self.coordinator.async_execute_command(
+                self._target, self._index, action
+            )
+        except Exception as err:
+            # Retour à l'état réel : l'appareil n'a pas exécuté la commande
+            self._optimistic = None
+            self.async_write_ha_state()
+            raise HomeAssistantError(
+                f"Erreur lors de la commande {self._target} {self._index}: {err}"
+            ) from err
+        # État confirmé inchangé : l'entité n'a pas été notifiée
+        if self._optimistic is not None:
+            self._optimistic = None
+            self.async_write_ha_state()
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Active le switch."""
+        await self._async_command("on", True)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Désactive le switch."""
+        await self._async_command("off", False)
+
+
+class TwoNSwitch(TwoNCommandSwitch):
+    """Représentation d'un switch matériel 2N."""
+
+    _target = "switch"
+
+    def __init__(
+        self,
+        coordinator: TwoNDataUpdateCoordinator,
+        switch: int,
+    ) -> None:
+        """Initialisation du switch."""
+        super().__init__(coordinator, switch, select_switch(switch))
+        self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_switch_{switch}"
+        self._attr_name = f"Switch {switch}"
+        self._attr_icon = "mdi:door"
+
+
+class TwoNOutputSwitch(TwoNCommandSwitch):
+    """Représentation d'une sortie IO 2N."""
+
+    _target = "io"
+
+    def __init__(
+        self,
+        coordinator: TwoNDataUpdateCoordinator,
+        port: int | str,
+    ) -> None:
+        """Initialisation de la sortie."""
+        super().__init__(coordinator, port, select_io_port(port))
+        self._attr_unique_id = f"{coordinator.system_info.get('result', {}).get('serialNumber', 'unknown')}_{DOMAIN}_output_{port}"
+        self._attr_name = f"Output {port}"
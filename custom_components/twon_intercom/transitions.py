@@ -0,0 +1,127 @@
+"""
+Détection des transitions d'état des appareils 2N.
+Fichier: custom_components/twon_intercom/transitions.py
+
+Deux instantanés successifs des données du coordinateur sont comparés ; seuls
+les changements réels (début de sonnerie, décroché, raccroché, front d'une
+entrée ou d'un switch) produisent un événement sur le bus Home Assistant.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .models import TwoNData
+
+EVENT_CALL_RINGING = "twon_intercom_call_ringing"
+EVENT_CALL_ANSWERED = "twon_intercom_call_answered"
+EVENT_CALL_ENDED = "twon_intercom_call_ended"
+EVENT_INPUT_CHANGED = "twon_intercom_input_changed"
+EVENT_OUTPUT_CHANGED = "twon_intercom_output_changed"
+EVENT_SWITCH_CHANGED = "twon_intercom_switch_changed"
+
+# Origine de device_time : événement du journal ou heure système extrapolée
+TIME_SOURCE_LOG = "log"
+TIME_SOURCE_ESTIMATED = "estimated"
+
+Transition = tuple[str, dict[str, Any]]
+
+
+def _edge(active: bool) -> str:
+    """Front d'un changement d'état binaire."""
+    return "rising" if active else "falling"
+
+
+def call_transitions(previous: TwoNData, current: TwoNData) -> list[Transition]:
+    """Transitions des sessions d'appel."""
+    if previous.call is None or current.call is None or previous.call is current.call:
+        return []
+    before = previous.call.sessions
+    after = current.call.sessions
+    transitions: list[Transition] = []
+
+    for session_id, session in after.items():
+        old = before.get(session_id)
+        old_state = old.state if old else None
+        if session.state == old_state:
+            continue
+        details = {
+            "session": session_id,
+            "direction": session.direction,
+            "previous_state": old_state,
+        }
+        if session.state == "ringing":
+            transitions.append((EVENT_CALL_RINGING, details))
+        elif session.state == "connected":
+            transitions.append((EVENT_CALL_ANSWERED, details))
+
+    for session_id, session in before.items():
+        if session_id not in after:
+            transitions.append(
+                (
+                    EVENT_CALL_ENDED,
+                    {
+                        "session": session_id,
+                        "direction": session.direction,
+                        "previous_state": session.state,
+                    },
+                )
+            )
+    return transitions
+
+
+def io_transitions(
+    previous: TwoNData, current: TwoNData, port_types: dict[Any, str]
+) -> list[Transition]:
+    """Fronts des entrées et sorties IO."""
+    if previous.io is None or current.io is None or previous.io is current.io:
+        return []
+    transitions: list[Transition] = []
+    for port, active in current.io.active.items():
+        old = previous.io.active.get(port)
+        if old is None or old == active:
+            continue
+        event = (
+            EVENT_OUTPUT_CHANGED
+            if port_types.get(port) == "output"
+            else EVENT_INPUT_CHANGED
+        )
+        transitions.append(
+            (event, {"port": port, "active": active, "edge": _edge(active)})
+        )
+    return transitions
+
+
+def switch_transitions(previous: TwoNData, current: TwoNData) -> list[Transition]:
+    """Fronts des switches."""
+    if (
+        previous.switches is None
+        or current.switches is None
+        or previous.switches is current.switches
+    ):
+        return []
+    transitions: list[Transition] = []
+    for switch, active in current.switches.active.items():
+        old = previous.switches.active.get(switch)
+        if old is None or old == active:
+            continue
+        transitions.append(
+            (
+                EVENT_SWITCH_CHANGED,
+                {"switch": switch, "active": active, "edge": _edge(active)},
+            )
+        )
+    return transitions
+
+
+def diff_transitions(
+    previous: TwoNData, current: TwoNData, port_types: dict[Any, str]
+) -> list[Transition]:
+    """Toutes les transitions entre deux instantanés."""
+    if previous is current:
+        return []
+    return [
+        *call_transitions(previous, current),
+        *io_transitions(previous, current, port_types),
+        *switch_transitions(previous, current),
+    ]